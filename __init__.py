@@ -12,41 +12,63 @@ Author: Renjie Wang
 Version: 0.1.0
 """
 
-# Model Clients
-from .rj_agent_toolkit.model_clients import (
-    call_ollama_llm,
-    call_qwen_llm_api,
-    get_ollama_embedding,
-    call_ollama_ocr
-)
+import importlib
+from importlib.util import find_spec
 
-# Agent
-from .rj_agent_toolkit.agents.chat_agent import ChatAgent
-from .rj_agent_toolkit.agents.prompt_manager import PromptManager
-from .rj_agent_toolkit.agents.tool_manager import ToolManager
+# 延迟导入映射: 导出名 -> 所在模块
+# 首次访问时才导入，import 本包时不再加载 LangChain、numpy、文档解析库等重量级依赖
+_AGENT_IMPORTS = {
+    # Model Clients
+    "call_ollama_llm": ".rj_agent_toolkit.model_clients",
+    "call_qwen_llm_api": ".rj_agent_toolkit.model_clients",
+    "get_ollama_embedding": ".rj_agent_toolkit.model_clients",
+    "call_ollama_ocr": ".rj_agent_toolkit.model_clients",
+    # Agent
+    "ChatAgent": ".rj_agent_toolkit.agents.chat_agent",
+    "PromptManager": ".rj_agent_toolkit.agents.prompt_manager",
+    "ToolManager": ".rj_agent_toolkit.agents.tool_manager",
+}
 
 # RAG Toolkit
-try:
-    from .rj_rag_toolkit import (
-        RecursiveChunker,
-        SemanticChunker,
-        EMLChunker,
-        PPTXChunker,
-        PDFParser,
-        DOCXParser,
-        EMLParser,
-        MSGParser,
-        PPTXParser,
-        BaseDBManager,
-        ChromaManager,
-        VectorRetriever,
-        HybridRetriever,
-        BM25Retriever,
-        Reranker
+_RAG_IMPORTS = {
+    name: ".rj_rag_toolkit"
+    for name in (
+        "RecursiveChunker",
+        "SemanticChunker",
+        "EMLChunker",
+        "PPTXChunker",
+        "PDFParser",
+        "DOCXParser",
+        "EMLParser",
+        "MSGParser",
+        "PPTXParser",
+        "BaseDBManager",
+        "ChromaManager",
+        "FAISSManager",
+        "VectorRetriever",
+        "HybridRetriever",
+        "BM25Retriever",
+        "Reranker",
     )
-    RAG_AVAILABLE = True
-except ImportError:
-    RAG_AVAILABLE = False
+}
+
+# RAG 模块的第三方依赖，仅检查是否已安装，不实际导入
+_RAG_REQUIREMENTS = (
+    "numpy",
+    "tiktoken",
+    "langchain_text_splitters",
+    "pdfplumber",
+    "docx",
+    "pptx",
+    "mailparser",
+    "extract_msg",
+    "bs4",
+    "html2text",
+    "mdformat",
+    "PIL",
+)
+
+RAG_AVAILABLE = all(find_spec(name) is not None for name in _RAG_REQUIREMENTS)
 
 __version__ = "0.1.0"
 __author__ = "Renjie Wang"
@@ -83,6 +105,7 @@ if RAG_AVAILABLE:
         # DB Manager
         "BaseDBManager",
         "ChromaManager",
+        "FAISSManager",
         # Retriever
         "VectorRetriever",
         "HybridRetriever",
@@ -108,3 +131,22 @@ def print_toolkit_info():
     
     if not RAG_AVAILABLE:
         print("⚠️  RAG模块不可用，请安装相关依赖：pip install -r requirements.txt")
+
+
+def __getattr__(name):
+    """按需导入导出对象 (PEP 562)"""
+    if name in _AGENT_IMPORTS:
+        module_name = _AGENT_IMPORTS[name]
+    elif name in _RAG_IMPORTS and RAG_AVAILABLE:
+        module_name = _RAG_IMPORTS[name]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(module_name, __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -13,18 +13,21 @@ Author: Renjie Wang
 Version: 0.1.0
 """
 
-# Model Clients imports
-from .model_clients import (
-    call_ollama_llm,
-    call_qwen_llm_api,
-    get_ollama_embedding,
-    call_ollama_ocr
-)
-
-# Agent imports
-from .agents.chat_agent import ChatAgent
-from .agents.prompt_manager import PromptManager
-from .agents.tool_manager import ToolManager
+import importlib
+
+# 延迟导入映射: 导出名 -> 所在模块
+# 首次访问时才导入对应模块，避免 import 时就加载 LangChain、Ollama 等重量级依赖
+_LAZY_IMPORTS = {
+    # Model Clients
+    "call_ollama_llm": ".model_clients",
+    "call_qwen_llm_api": ".model_clients",
+    "get_ollama_embedding": ".model_clients",
+    "call_ollama_ocr": ".model_clients",
+    # Agent
+    "ChatAgent": ".agents.chat_agent",
+    "PromptManager": ".agents.prompt_manager",
+    "ToolManager": ".agents.tool_manager",
+}
 
 __version__ = "0.1.0"
 __author__ = "Renjie Wang"
@@ -50,3 +53,17 @@ DEFAULT_CONFIG = {
     "module_name": "agent_toolkit",
     "supported_python": ">=3.8",
 }
+
+
+def __getattr__(name):
+    """按需导入导出对象 (PEP 562)"""
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
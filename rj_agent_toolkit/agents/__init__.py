@@ -9,12 +9,32 @@ RJ Agent Toolkit - Agents Module
 AI Agent 模块,提供基于 LangChain 的对话代理功能。
 """
 
-from .chat_agent import ChatAgent
-from .prompt_manager import PromptManager
-from .tool_manager import ToolManager
+import importlib
+
+# 延迟导入映射: 导出名 -> 所在模块
+# 仅使用 PromptManager / ToolManager 时无需加载 LangChain
+_LAZY_IMPORTS = {
+    "ChatAgent": ".chat_agent",
+    "PromptManager": ".prompt_manager",
+    "ToolManager": ".tool_manager",
+}
 
 __all__ = [
     "ChatAgent",
     "PromptManager",
     "ToolManager"
 ]
+
+
+def __getattr__(name):
+    """按需导入导出对象 (PEP 562)"""
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -80,6 +80,81 @@ class ChatAgent:
                 'thread_id': str        # 会话 ID
             }
         """
+        messages = self._prepare_messages(user_input, thread_id, history_messages)
+        
+        # 配置会话
+        config = {"configurable": {"thread_id": thread_id}}
+        
+        try:
+            # 调用 Agent
+            response = self.agent.invoke(
+                {"messages": messages},
+                config=config
+            )
+            return self._build_result(response, thread_id)
+        
+        except Exception as e:
+            print(f"[ERROR] Agent 处理失败: {str(e)}")
+            raise
+    
+    async def achat(
+        self,
+        user_input: str,
+        thread_id: str,
+        history_messages: Optional[List] = None
+    ) -> Dict:
+        """
+        异步处理用户输入并返回 AI 回复
+        
+        与 chat 参数和返回值相同，内部使用 agent.ainvoke，不阻塞事件循环。
+        多个查询可通过 asyncio.gather 并发执行，总耗时接近单次请求的网络延迟:
+            results = await asyncio.gather(
+                *(agent.achat(q, thread_id=f"t{i}") for i, q in enumerate(queries))
+            )
+        注意: 同一 thread_id 的并发请求会相互覆盖检查点，并发时应使用不同的 thread_id
+        
+        Args:
+            user_input: 用户输入的文本
+            thread_id: 会话线程 ID
+            history_messages: 历史消息列表(可选)
+        
+        Returns:
+            Dict: 与 chat 相同的结果字典
+        """
+        messages = self._prepare_messages(user_input, thread_id, history_messages)
+        
+        # 配置会话
+        config = {"configurable": {"thread_id": thread_id}}
+        
+        try:
+            # 异步调用 Agent
+            response = await self.agent.ainvoke(
+                {"messages": messages},
+                config=config
+            )
+            return self._build_result(response, thread_id)
+        
+        except Exception as e:
+            print(f"[ERROR] Agent 处理失败: {str(e)}")
+            raise
+    
+    def _prepare_messages(
+        self,
+        user_input: str,
+        thread_id: str,
+        history_messages: Optional[List] = None
+    ) -> List:
+        """
+        构造本次调用的消息列表
+        
+        Args:
+            user_input: 用户输入的文本
+            thread_id: 会话线程 ID
+            history_messages: 历史消息列表(可选)
+        
+        Returns:
+            List: 追加用户输入并截断后的消息列表
+        """
         # 初始化消息列表
         messages = history_messages.copy() if history_messages else []
         
@@ -94,30 +169,29 @@ class ChatAgent:
         print(f"[DEBUG] 处理消息, thread_id: {thread_id}")
         print(f"[DEBUG] 当前消息数量: {len(messages)}")
         
-        # 配置会话
-        config = {"configurable": {"thread_id": thread_id}}
+        return messages
+    
+    def _build_result(self, response: Dict, thread_id: str) -> Dict:
+        """
+        从 Agent 返回值中提取 AI 回复
         
-        try:
-            # 调用 Agent
-            response = self.agent.invoke(
-                {"messages": messages},
-                config=config
-            )
-            
-            # 提取 AI 回复
-            ai_response = response['messages'][-1].content
-            
-            print(f"[DEBUG] AI 回复长度: {len(ai_response)} 字符")
-            
-            return {
-                'response': ai_response,
-                'messages': response['messages'],
-                'thread_id': thread_id
-            }
+        Args:
+            response: agent.invoke / agent.ainvoke 的返回值
+            thread_id: 会话线程 ID
         
-        except Exception as e:
-            print(f"[ERROR] Agent 处理失败: {str(e)}")
-            raise
+        Returns:
+            Dict: 包含 response、messages、thread_id 的结果字典
+        """
+        # 提取 AI 回复
+        ai_response = response['messages'][-1].content
+        
+        print(f"[DEBUG] AI 回复长度: {len(ai_response)} 字符")
+        
+        return {
+            'response': ai_response,
+            'messages': response['messages'],
+            'thread_id': thread_id
+        }
     
     def get_tools_info(self) -> List[Dict]:
         """
@@ -9,9 +9,16 @@
 提供统一的接口调用各种AI模型，包括LLM、Embedding和OCR模型。
 """
 
-from .llm import call_ollama_llm, call_qwen_llm_api
-from .embedding import get_ollama_embedding
-from .ocr import call_ollama_ocr
+import importlib
+
+# 延迟导入映射: 导出名 -> 所在模块
+# 各客户端依赖不同的 SDK（langchain_openai / langchain_ollama / ollama），按需加载
+_LAZY_IMPORTS = {
+    "call_ollama_llm": ".llm",
+    "call_qwen_llm_api": ".llm",
+    "get_ollama_embedding": ".embedding",
+    "call_ollama_ocr": ".ocr",
+}
 
 __all__ = [
     "call_ollama_llm",
@@ -19,3 +26,17 @@ __all__ = [
     "get_ollama_embedding",
     "call_ollama_ocr"
 ]
+
+
+def __getattr__(name):
+    """按需导入导出对象 (PEP 562)"""
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
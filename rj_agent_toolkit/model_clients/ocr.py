@@ -6,6 +6,9 @@
 import ollama
 import re
 
+# 匹配被代码块包裹的 HTML 表格（如 ```html <table>...</table> ```）
+FENCED_TABLE_PATTERN = re.compile(r"```[^\n]*\s*(<table[\s\S]*?</table>)\s*```", re.IGNORECASE)
+
 
 def call_ollama_ocr(image_path: str, model: str, base_url: str = "http://localhost:11434", prompt: str = None) -> str:
     """
@@ -52,10 +55,7 @@ Rules:
         content = response['message']['content']
 
         # 如果模型把表格用代码块包裹（如 ```html 或 ```），提取出其中的 <table>...</table>
-        content = re.sub(r"```[^\n]*\s*(<table[\s\S]*?</table>)\s*```",
-                         r"\1",
-                         content,
-                         flags=re.IGNORECASE)
+        content = FENCED_TABLE_PATTERN.sub(r"\1", content)
 
         return content.strip()
 
@@ -10,33 +10,36 @@ RAG Toolkit
 提供完整的文档处理、向量检索、重排序等RAG功能。
 """
 
-# Chunker imports
-from .chunker.base_chunker import BaseChunker
-from .chunker.recursive_chunker import RecursiveChunker
-from .chunker.semantic_chunker import SemanticChunker
-from .chunker.eml_chunker import EMLChunker
-from .chunker.pptx_chunker import PPTXChunker
+import importlib
 
-# Parser imports
-from .parser.base_parser import BaseParser
-from .parser.pdf_parser import PDFParser
-from .parser.docx_parser import DOCXParser
-from .parser.eml_parser import EMLParser
-from .parser.msg_parser import MSGParser
-from .parser.pptx_parser import PPTXParser
-
-# DB Manager imports
-from .db_manager.base_db_manager import BaseDBManager
-from .db_manager.chroma_manager import ChromaManager
-
-# Retriever imports
-from .retriever.base_retriever import BaseRetriever
-from .retriever.vector_retriever import VectorRetriever
-from .retriever.hybrid_retriever import HybridRetriever
-from .retriever.bm25_retriever import BM25Retriever
-
-# Reranker imports
-from .reranker.reranker import Reranker
+# 延迟导入映射: 导出名 -> 所在模块
+# 首次访问时才导入，只使用切块器时不会加载 chromadb、pdfplumber 等依赖
+_LAZY_IMPORTS = {
+    # Chunker
+    "BaseChunker": ".chunker.base_chunker",
+    "RecursiveChunker": ".chunker.recursive_chunker",
+    "SemanticChunker": ".chunker.semantic_chunker",
+    "EMLChunker": ".chunker.eml_chunker",
+    "PPTXChunker": ".chunker.pptx_chunker",
+    # Parser
+    "BaseParser": ".parser.base_parser",
+    "PDFParser": ".parser.pdf_parser",
+    "DOCXParser": ".parser.docx_parser",
+    "EMLParser": ".parser.eml_parser",
+    "MSGParser": ".parser.msg_parser",
+    "PPTXParser": ".parser.pptx_parser",
+    # DB Manager
+    "BaseDBManager": ".db_manager.base_db_manager",
+    "ChromaManager": ".db_manager.chroma_manager",
+    "FAISSManager": ".db_manager.faiss_manager",
+    # Retriever
+    "BaseRetriever": ".retriever.base_retriever",
+    "VectorRetriever": ".retriever.vector_retriever",
+    "HybridRetriever": ".retriever.hybrid_retriever",
+    "BM25Retriever": ".retriever.bm25_retriever",
+    # Reranker
+    "Reranker": ".reranker.reranker",
+}
 
 __version__ = "0.1.0"
 __all__ = [
@@ -56,6 +59,7 @@ __all__ = [
     # DB Manager exports
     "BaseDBManager",
     "ChromaManager",
+    "FAISSManager",
     # Retriever exports
     "BaseRetriever",
     "VectorRetriever",
@@ -64,3 +68,17 @@ __all__ = [
     # Reranker exports
     "Reranker"
 ]
+
+
+def __getattr__(name):
+    """按需导入导出对象 (PEP 562)"""
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
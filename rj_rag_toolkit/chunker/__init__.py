@@ -13,11 +13,17 @@
 - PPTXChunker: 幻灯片切块器
 """
 
-from .base_chunker import BaseChunker
-from .recursive_chunker import RecursiveChunker  
-from .semantic_chunker import SemanticChunker
-from .eml_chunker import EMLChunker
-from .pptx_chunker import PPTXChunker
+import importlib
+
+# 延迟导入映射: 导出名 -> 所在模块
+# 各切块器依赖不同（LangChain、tiktoken、numpy），按需加载
+_LAZY_IMPORTS = {
+    "BaseChunker": ".base_chunker",
+    "RecursiveChunker": ".recursive_chunker",
+    "SemanticChunker": ".semantic_chunker",
+    "EMLChunker": ".eml_chunker",
+    "PPTXChunker": ".pptx_chunker",
+}
 
 __all__ = [
     "BaseChunker",
@@ -26,3 +32,17 @@ __all__ = [
     "EMLChunker",
     "PPTXChunker",
 ]
+
+
+def __getattr__(name):
+    """按需导入导出对象 (PEP 562)"""
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
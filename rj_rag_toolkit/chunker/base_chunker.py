@@ -9,24 +9,54 @@
 所有切块器的基类，定义统一的接口。
 """
 
+import logging
+import os
+import pickle
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Sequence
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@lru_cache(maxsize=8)
+def get_tokenizer(model: str = "gpt-4"):
+    """
+    获取 tiktoken 编码器
+    
+    按模型名缓存，同一进程内的所有切块器共享同一个编码器实例；
+    tiktoken 仅在首次使用 token 模式时导入。
+    
+    Args:
+        model: 模型名称，默认 "gpt-4"
+        
+    Returns:
+        tiktoken.Encoding 实例
+    """
+    import tiktoken
+    return tiktoken.encoding_for_model(model)
+
+
+@dataclass(frozen=True)
 class ChunkConfig:
-    """切块配置"""
+    """切块配置
+    
+    不可变且可哈希，可直接作为缓存键使用；separators 统一存储为元组。
+    """
     chunk_size: int = 1000
     chunk_overlap: int = 200
-    separators: Optional[List[str]] = None
+    separators: Optional[Sequence[str]] = None
     keep_separator: bool = False
     add_start_index: bool = True
     strip_whitespace: bool = True
     
     def __post_init__(self):
         if self.separators is None:
-            self.separators = ["\n\n", "\n", " ", ""]
+            object.__setattr__(self, 'separators', ("\n\n", "\n", " ", ""))
+        else:
+            object.__setattr__(self, 'separators', tuple(self.separators))
 
 
 class BaseChunker(ABC):
@@ -67,4 +97,48 @@ class BaseChunker(ABC):
             切块后的文本列表
         """
         pass
-
+    
+    def chunk_batch(
+        self,
+        texts: List[str],
+        max_workers: Optional[int] = None,
+        use_processes: bool = False
+    ) -> List[List[str]]:
+        """
+        并行切分多篇文本
+        
+        各文本之间相互独立，使用线程池或进程池并行调用 chunk，
+        结果顺序与输入顺序一致。
+        
+        Args:
+            texts: 输入的 Markdown 文本列表
+            max_workers: 最大并发数，默认由执行器决定
+            use_processes: 是否使用进程池
+                - False: 线程池（默认），共享 embedding 函数、tokenizer 等资源，
+                  适合 SemanticChunker 等以外部调用为主的切块器
+                - True: 进程池，适合纯 Python 的 CPU 密集切分；
+                  切块器无法序列化（如持有 lambda）时自动回退到线程池
+            
+        Returns:
+            每篇文本对应的切块列表
+        """
+        if not texts:
+            return []
+        if len(texts) == 1:
+            return [self.chunk(texts[0])]
+        
+        if use_processes:
+            try:
+                pickle.dumps(self)
+            except Exception as e:
+                logger.warning("切块器无法序列化，回退到线程池: %s", e)
+                use_processes = False
+        
+        if use_processes:
+            workers = max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(texts) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(self.chunk, texts, chunksize=chunksize))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.chunk, texts))
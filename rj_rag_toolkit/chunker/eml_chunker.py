@@ -19,8 +19,35 @@
 import re
 from typing import List, Dict, Optional
 from pathlib import Path
-import tiktoken
-from .base_chunker import BaseChunker, ChunkConfig
+from .base_chunker import BaseChunker, ChunkConfig, get_tokenizer
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# 正则表达式（模块级预编译，避免每封邮件、每一行重复查找编译缓存）
+# 邮件分隔标记: ## Email N
+EMAIL_MARKER_PATTERN = re.compile(r'^## Email (\d+)\s*$', re.MULTILINE)
+# 表格内容（整体保护，不被切分）
+TABLE_PATTERN = re.compile(r'<table>.*?</table>', re.DOTALL)
+# 句子结束标记：。！？；\n\n（段落）；. ! ? ;，同时保护表格占位符不被切分
+# 标准库 re 在没有句末标点的长文本上会反复回溯（最坏平方复杂度），
+# 安装 google-re2 后改用线性时间的 RE2 引擎（该模式不含 "."，无需 DOTALL）
+SENTENCE_PATTERN = (re2 if RE2_AVAILABLE else re).compile(
+    r'(__TABLE_PLACEHOLDER_\d+__|[^。！？；.!?\n]+[。！？；.!?]+|\n\n)'
+)
+# 邮箱地址，支持常见格式: user@domain.com, <user@domain.com>, [user@domain.com](mailto:user@domain.com)
+_EMAIL = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+MAILTO_LINK_PATTERN = re.compile(r'\[' + _EMAIL + r'\]\(mailto:' + _EMAIL + r'\)')
+BRACKETED_EMAIL_PATTERN = re.compile(r'<' + _EMAIL + r'>')
+EMAIL_ADDRESS_PATTERN = re.compile(_EMAIL)
+# 删除邮箱后的行内清理（[^\S\n] 为不含换行的空白，整段文本一次处理也不会跨行）
+MULTI_SPACE_PATTERN = re.compile(r' +')
+REPEATED_DELIMITER_PATTERN = re.compile(r'[^\S\n]*[,;][^\S\n]*[,;]+')
+COLON_COMMA_PATTERN = re.compile(r':[^\S\n]*,')
+LINE_EDGE_SPACE_PATTERN = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE)
 
 
 class EMLChunker(BaseChunker):
@@ -86,13 +113,32 @@ class EMLChunker(BaseChunker):
         
         # 根据 length_type 选择长度函数
         if length_type == "char":
+            self._tokenizer = None
             self._length_function = len
         elif length_type == "token":
-            tokenizer = tiktoken.encoding_for_model("gpt-4")
+            tokenizer = get_tokenizer("gpt-4")
+            self._tokenizer = tokenizer
             self._length_function = lambda text: len(tokenizer.encode(text))
         else:
             raise ValueError(f"不支持的 length_type: {length_type}，仅支持 'char' 或 'token'")
     
+    def _lengths(self, texts: List[str]) -> List[int]:
+        """
+        批量计算文本长度
+        
+        token 模式下使用 tiktoken 的 encode_batch 一次性编码（内部多线程），
+        避免逐条调用 encode 带来的 Python 到 Rust 的调用开销。
+        
+        Args:
+            texts: 文本列表
+            
+        Returns:
+            与 texts 顺序一致的长度列表
+        """
+        if self._tokenizer is None:
+            return [len(text) for text in texts]
+        return [len(tokens) for tokens in self._tokenizer.encode_batch(texts)]
+    
     def _split_email_by_messages(self, markdown_content: str) -> List[str]:
         """
         将邮件 Markdown 内容按照 ## Email N 标记切分
@@ -103,13 +149,12 @@ class EMLChunker(BaseChunker):
         Returns:
             邮件消息列表，每个元素是一封单独的邮件
         """
-        # 识别 ## Email N 标记
-        pattern = r'^## Email (\d+)\s*$'
+        # 快速预检：不含标记文本时无需执行正则扫描（str 子串查找远快于正则）
+        if '## Email ' not in markdown_content:
+            return [markdown_content]
         
-        # 找到所有邮件标记的位置
-        message_positions = []
-        for match in re.finditer(pattern, markdown_content, re.MULTILINE):
-            message_positions.append(match.start())
+        # 找到所有 ## Email N 标记的位置
+        message_positions = [match.start() for match in EMAIL_MARKER_PATTERN.finditer(markdown_content)]
         
         # 如果没有找到任何标记，返回整个内容
         if not message_positions:
@@ -147,23 +192,18 @@ class EMLChunker(BaseChunker):
         Returns:
             切分后的文本块列表
         """
-        # 先提取并保护表格，用占位符替换
-        table_pattern = r'<table>.*?</table>'
-        tables = []
+        # 先提取并保护表格，用占位符替换（单次扫描，避免每个表格都重新扫描全文）
         table_placeholders = {}
         
-        for match in re.finditer(table_pattern, text, re.DOTALL):
-            table_content = match.group(0)
-            placeholder = f"__TABLE_PLACEHOLDER_{len(tables)}__"
-            tables.append(table_content)
-            table_placeholders[placeholder] = table_content
-            text = text.replace(table_content, placeholder, 1)
+        def protect_table(match):
+            placeholder = f"__TABLE_PLACEHOLDER_{len(table_placeholders)}__"
+            table_placeholders[placeholder] = match.group(0)
+            return placeholder
+        
+        text = TABLE_PATTERN.sub(protect_table, text)
         
         # 按句子分隔（支持中英文）
-        # 句子结束标记：。！？；\n\n（段落）；. ! ? ;
-        # 同时保护表格占位符不被切分
-        sentence_pattern = r'(__TABLE_PLACEHOLDER_\d+__|[^。！？；.!?\n]+[。！？；.!?]+|\n\n)'
-        sentences = re.findall(sentence_pattern, text, re.DOTALL)
+        sentences = SENTENCE_PATTERN.findall(text)
         
         # 将表格占位符还原
         restored_sentences = []
@@ -178,17 +218,16 @@ class EMLChunker(BaseChunker):
         if not sentences:
             sentences = text.split('\n\n')
         
+        # 清理空句子，并一次性批量计算所有句子的长度
+        sentences = [sentence.strip() for sentence in sentences]
+        sentences = [sentence for sentence in sentences if sentence]
+        sentence_lengths = self._lengths(sentences)
+        
         chunks = []
         current_chunk = []
         current_tokens = 0
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-            
-            sentence_tokens = self._length_function(sentence)
-            
+        for sentence, sentence_tokens in zip(sentences, sentence_lengths):
             # 如果单个句子超过最大 token，需要进一步切分
             if sentence_tokens > max_tokens:
                 # 保存当前块
@@ -197,13 +236,13 @@ class EMLChunker(BaseChunker):
                     current_chunk = []
                     current_tokens = 0
                 
-                # 对长句子按词切分（最后的手段）
+                # 对长句子按词切分（最后的手段），所有词的长度一次性批量计算
                 words = sentence.split()
+                word_lengths = self._lengths([word + ' ' for word in words])
                 temp_chunk = []
                 temp_tokens = 0
                 
-                for word in words:
-                    word_tokens = self._length_function(word + ' ')
+                for word, word_tokens in zip(words, word_lengths):
                     if temp_tokens + word_tokens > max_tokens and temp_chunk:
                         chunks.append(' '.join(temp_chunk))
                         temp_chunk = [word]
@@ -243,34 +282,26 @@ class EMLChunker(BaseChunker):
         Returns:
             删除邮箱地址后的文本
         """
-        # 匹配邮箱地址的正则表达式
-        # 支持常见格式: user@domain.com, <user@domain.com>, [user@domain.com](mailto:user@domain.com)
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        
         # 先删除 Markdown 链接格式的邮箱: [xxx@xxx.com](mailto:xxx@xxx.com)
-        text = re.sub(r'\[' + email_pattern + r'\]\(mailto:' + email_pattern + r'\)', '', text)
+        text = MAILTO_LINK_PATTERN.sub('', text)
         
         # 删除尖括号包裹的邮箱: <xxx@xxx.com>
-        text = re.sub(r'<' + email_pattern + r'>', '', text)
+        text = BRACKETED_EMAIL_PATTERN.sub('', text)
         
         # 删除普通的邮箱地址
-        text = re.sub(email_pattern, '', text)
-        
-        # 清理同一行内的多余空格(不跨行)
-        lines = text.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            # 多个空格合并为一个
-            line = re.sub(r' +', ' ', line)
-            # 清理连续的逗号分号
-            line = re.sub(r'\s*[,;]\s*[,;]+', ',', line)
-            # 清理 ": ," 这样的情况
-            line = re.sub(r':\s*,', ':', line)
-            # 清理行首行尾空格
-            line = line.strip()
-            cleaned_lines.append(line)
-        
-        return '\n'.join(cleaned_lines)
+        text = EMAIL_ADDRESS_PATTERN.sub('', text)
+        
+        # 清理同一行内的多余空格(不跨行)，各规则直接作用于整段文本，无需逐行处理
+        # 多个空格合并为一个
+        text = MULTI_SPACE_PATTERN.sub(' ', text)
+        # 清理连续的逗号分号
+        text = REPEATED_DELIMITER_PATTERN.sub(',', text)
+        # 清理 ": ," 这样的情况
+        text = COLON_COMMA_PATTERN.sub(':', text)
+        # 清理行首行尾空格
+        text = LINE_EDGE_SPACE_PATTERN.sub('', text)
+        
+        return text
     
     def chunk(self, markdown_text: str) -> List[str]:
         """
@@ -307,9 +338,7 @@ class EMLChunker(BaseChunker):
         chunks = []
         max_tokens = self.config.chunk_size
         
-        for message in messages:
-            message_tokens = self._length_function(message)
-            
+        for message, message_tokens in zip(messages, self._lengths(messages)):
             # 如果邮件未超过限制，直接添加
             if message_tokens <= max_tokens:
                 chunks.append(message)
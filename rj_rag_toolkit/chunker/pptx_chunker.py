@@ -20,8 +20,7 @@ PPT 切块器
 import re
 from typing import List, Dict, Optional
 from pathlib import Path
-import tiktoken
-from .base_chunker import BaseChunker, ChunkConfig
+from .base_chunker import BaseChunker, ChunkConfig, get_tokenizer
 
 
 class PPTXChunker(BaseChunker):
@@ -82,7 +81,7 @@ class PPTXChunker(BaseChunker):
         if length_type == "char":
             self._length_function = len
         elif length_type == "token":
-            tokenizer = tiktoken.encoding_for_model("gpt-4")
+            tokenizer = get_tokenizer("gpt-4")
             self._length_function = lambda text: len(tokenizer.encode(text))
         else:
             raise ValueError(f"不支持的 length_type: {length_type}，仅支持 'char' 或 'token'")
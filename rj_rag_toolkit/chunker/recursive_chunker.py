@@ -12,8 +12,7 @@
 
 from typing import List, Optional
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-import tiktoken
-from .base_chunker import BaseChunker, ChunkConfig
+from .base_chunker import BaseChunker, ChunkConfig, get_tokenizer
 
 class RecursiveChunker(BaseChunker):
     """
@@ -97,7 +96,7 @@ class RecursiveChunker(BaseChunker):
         if length_type == "char":
             self.length_function = len
         elif length_type == "token":
-            tokenizer = tiktoken.encoding_for_model("gpt-4")
+            tokenizer = get_tokenizer("gpt-4")
             self.length_function = lambda text: len(tokenizer.encode(text))
         else:
             raise ValueError(f"不支持的 length_type: {length_type}，仅支持 'char' 或 'token'")
@@ -106,7 +105,7 @@ class RecursiveChunker(BaseChunker):
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=self.config.chunk_size,
             chunk_overlap=self.config.chunk_overlap,
-            separators=self.config.separators,
+            separators=list(self.config.separators),
             keep_separator=self.config.keep_separator,
             add_start_index=self.config.add_start_index,
             strip_whitespace=self.config.strip_whitespace,
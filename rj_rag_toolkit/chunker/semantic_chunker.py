@@ -10,11 +10,17 @@
 使用句子embedding和相似度计算来确定切分点。
 """
 
+import hashlib
+import threading
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Callable
-from .base_chunker import BaseChunker, ChunkConfig
+from .base_chunker import BaseChunker, ChunkConfig, get_tokenizer
 import re
-import tiktoken
+
+# 中英文句子分割正则（模块级预编译）
+SENTENCE_SPLIT_PATTERN = re.compile(r'[。！？.!?]+(?=\s|$|[A-Z\u4e00-\u9fff])')
 
 
 class SemanticChunker(BaseChunker):
@@ -31,7 +37,11 @@ class SemanticChunker(BaseChunker):
         embedding_func: Callable[[List[str]], List[List[float]]] = None,
         similarity_threshold: float = 0.5,
         min_chunk_size: int = 100,
-        length_type: str = "char"
+        length_type: str = "char",
+        cache_size: int = 128,
+        embedding_cache_size: int = 10000,
+        embedding_batch_size: int = 64,
+        embedding_max_workers: int = 1
     ):
         """
         初始化语义切块器
@@ -47,6 +57,15 @@ class SemanticChunker(BaseChunker):
             length_type: 长度计算方式，默认 "char"
                 - "char": 按字符数计算
                 - "token": 按 token 数计算（使用 GPT-4 tokenizer）
+            cache_size: 切块结果缓存的最大条目数，0 表示不缓存 (默认: 128)
+                      相同文本以相同参数（config、similarity_threshold、min_chunk_size）
+                      再次切分时直接返回缓存结果，无需重新计算 embedding
+            embedding_cache_size: 句子向量缓存的最大条目数，0 表示不缓存 (默认: 10000)
+                      文本有少量修改或不同文档包含相同句子时，只为新句子计算 embedding
+            embedding_batch_size: 并发调用 embedding 时每个分片的句子数 (默认: 64)
+            embedding_max_workers: 并发调用 embedding_func 的线程数 (默认: 1，即一次性调用)
+                      embedding_func 为远程服务（OpenAI、Ollama 等）时可调大以并发请求，
+                      此时 embedding_func 需要是线程安全的
         
         Raises:
             ValueError: 如果未提供 embedding_func
@@ -59,12 +78,20 @@ class SemanticChunker(BaseChunker):
         self.embedding_func = embedding_func
         self.similarity_threshold = similarity_threshold
         self.min_chunk_size = min_chunk_size
+        self.cache_size = cache_size
+        self._chunk_cache = OrderedDict()
+        self.embedding_cache_size = embedding_cache_size
+        self._embedding_cache = OrderedDict()
+        # chunk_batch 默认在线程池中共享同一个切块器，缓存读写需加锁
+        self._cache_lock = threading.Lock()
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_max_workers = embedding_max_workers
         
         # 根据 length_type 选择长度函数
         if length_type == "char":
             self._length_function = len
         elif length_type == "token":
-            tokenizer = tiktoken.encoding_for_model("gpt-4")
+            tokenizer = get_tokenizer("gpt-4")
             self._length_function = lambda text: len(tokenizer.encode(text))
         else:
             raise ValueError(f"不支持的 length_type: {length_type}，仅支持 'char' 或 'token'")
@@ -83,58 +110,97 @@ class SemanticChunker(BaseChunker):
             RuntimeError: 如果embedding处理失败
         """
         try:
-            return self.embedding_func(texts)
+            if self.embedding_max_workers <= 1 or len(texts) <= self.embedding_batch_size:
+                return self.embedding_func(texts)
+            
+            # 按分片并发调用，结果按原顺序拼接
+            batch_size = max(1, self.embedding_batch_size)
+            shards = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+            embeddings = []
+            with ThreadPoolExecutor(max_workers=min(self.embedding_max_workers, len(shards))) as executor:
+                for shard_embeddings in executor.map(self.embedding_func, shards):
+                    embeddings.extend(shard_embeddings)
+            return embeddings
         except Exception as e:
             raise RuntimeError(f"Embedding 处理失败: {str(e)}")
     
-    def _split_into_sentences(self, text: str) -> List[str]:
+    def _embed_sentences(self, sentences: List[str]) -> np.ndarray:
         """
-        将文本分割成句子
+        获取句子向量，按句子内容哈希进行 LRU 缓存
         
         Args:
-            text: 输入文本
+            sentences: 句子列表
             
         Returns:
-            句子列表
+            句子向量矩阵 (n, d)，float32
         """
-        # 中英文句子分割正则
-        pattern = r'[。！？.!?]+(?=\s|$|[A-Z\u4e00-\u9fff])'
-        sentences = re.split(pattern, text)
+        if self.embedding_cache_size <= 0:
+            return np.ascontiguousarray(self._call_embedding(sentences), dtype=np.float32)
+        
+        keys = [hashlib.blake2b(sentence.encode('utf-8'), digest_size=16).digest() for sentence in sentences]
+        
+        # 命中的向量在锁内取出到本地，其他线程随后淘汰条目不影响本次结果；
+        # 收集未命中的句子，重复句子只计算一次
+        found = {}
+        missing = {}
+        with self._cache_lock:
+            for key, sentence in zip(keys, sentences):
+                if key in found or key in missing:
+                    continue
+                embedding = self._embedding_cache.get(key)
+                if embedding is not None:
+                    self._embedding_cache.move_to_end(key)
+                    found[key] = embedding
+                else:
+                    missing[key] = sentence
         
-        # 清理空句子和过短句子
-        sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
+        if missing:
+            # embedding 调用在锁外进行，不阻塞其他线程
+            new_embeddings = self._call_embedding(list(missing.values()))
+            for key, embedding in zip(missing, new_embeddings):
+                found[key] = np.asarray(embedding, dtype=np.float32)
+            
+            with self._cache_lock:
+                for key in missing:
+                    self._embedding_cache[key] = found[key]
+                # 淘汰最久未使用的条目
+                while len(self._embedding_cache) > self.embedding_cache_size:
+                    self._embedding_cache.popitem(last=False)
         
-        return sentences
+        return np.stack([found[key] for key in keys])
     
-    def _calculate_similarity_matrix(self, sentences: List[str]) -> np.ndarray:
+    def _split_into_sentences(self, text: str) -> List[str]:
         """
-        计算句子间的相似度矩阵
+        将文本分割成句子
         
         Args:
-            sentences: 句子列表
+            text: 输入文本
             
         Returns:
-            相似度矩阵
+            句子列表
         """
-        if len(sentences) <= 1:
-            return np.array([[1.0]])
-        
-        # 获取句子嵌入
-        embeddings = self._call_embedding(sentences)
-        embeddings = np.array(embeddings)
-        
-        # 计算余弦相似度矩阵
-        similarity_matrix = np.dot(embeddings, embeddings.T)
+        sentences = SENTENCE_SPLIT_PATTERN.split(text)
         
-        return similarity_matrix
+        # 清理空句子和过短句子（每个片段只 strip 一次）
+        return [s for s in (fragment.strip() for fragment in sentences) if len(s) > 10]
     
-    def _find_breakpoints(self, sentences: List[str], similarity_matrix: np.ndarray) -> List[int]:
+    def _find_breakpoints(
+        self, 
+        sentences: List[str], 
+        embeddings: np.ndarray,
+        sentence_lengths: Optional[List[int]] = None
+    ) -> List[int]:
         """
         基于相似度找到切分点
         
+        句子与当前块的平均余弦相似度等于该句向量与块内向量之和的点积除以句子数，
+        因此只需维护当前块的向量和，无需构造 n×n 相似度矩阵，
+        内存为 O(n·d)，可处理很长的文档。
+        
         Args:
             sentences: 句子列表
-            similarity_matrix: 相似度矩阵
+            embeddings: 句子向量矩阵 (n, d)
+            sentence_lengths: 预先计算的句子长度列表（可选）
             
         Returns:
             切分点索引列表
@@ -144,14 +210,17 @@ class SemanticChunker(BaseChunker):
         current_chunk_start = 0
         current_chunk_size = 0
         
+        if sentence_lengths is None:
+            sentence_lengths = [self._length_function(sentence) for sentence in sentences]
+        
+        # 当前块 [current_chunk_start, i) 内句子向量之和
+        chunk_embedding_sum = np.zeros(embeddings.shape[1], dtype=np.float64)
+        
         for i in range(1, len(sentences)):
-            # 计算与当前块起始点的平均相似度
-            similarity_scores = []
-            for j in range(current_chunk_start, i):
-                similarity_scores.append(similarity_matrix[i][j])
-            
-            avg_similarity = np.mean(similarity_scores) if similarity_scores else 1.0
-            current_chunk_size += self._length_function(sentences[i])
+            # 计算与当前块的平均相似度
+            chunk_embedding_sum += embeddings[i - 1]
+            avg_similarity = float(embeddings[i] @ chunk_embedding_sum) / (i - current_chunk_start)
+            current_chunk_size += sentence_lengths[i]
             
             # 判断是否需要切分
             should_break = False
@@ -168,7 +237,8 @@ class SemanticChunker(BaseChunker):
             if should_break and current_chunk_size >= self.min_chunk_size:
                 breakpoints.append(i)
                 current_chunk_start = i
-                current_chunk_size = self._length_function(sentences[i])
+                current_chunk_size = sentence_lengths[i]
+                chunk_embedding_sum[:] = 0.0
         
         # 添加结束点
         if breakpoints[-1] != len(sentences):
@@ -179,7 +249,8 @@ class SemanticChunker(BaseChunker):
     def _create_chunks_from_breakpoints(
         self, 
         sentences: List[str], 
-        breakpoints: List[int]
+        breakpoints: List[int],
+        sentence_lengths: Optional[List[int]] = None
     ) -> List[str]:
         """
         根据切分点创建文本块
@@ -187,10 +258,14 @@ class SemanticChunker(BaseChunker):
         Args:
             sentences: 句子列表
             breakpoints: 切分点列表
+            sentence_lengths: 预先计算的句子长度列表（可选）
             
         Returns:
             文本块列表
         """
+        if sentence_lengths is None:
+            sentence_lengths = [self._length_function(sentence) for sentence in sentences]
+        
         chunks = []
         
         for i in range(len(breakpoints) - 1):
@@ -207,7 +282,7 @@ class SemanticChunker(BaseChunker):
             # 添加重叠内容
             if i > 0 and self.config.chunk_overlap > 0:
                 overlap_sentences = self._get_overlap_sentences(
-                    sentences, start_idx, self.config.chunk_overlap
+                    sentences, start_idx, self.config.chunk_overlap, sentence_lengths
                 )
                 chunk_text = "".join(overlap_sentences) + chunk_text
             
@@ -215,7 +290,13 @@ class SemanticChunker(BaseChunker):
         
         return chunks
     
-    def _get_overlap_sentences(self, sentences: List[str], start_idx: int, overlap_size: int) -> List[str]:
+    def _get_overlap_sentences(
+        self, 
+        sentences: List[str], 
+        start_idx: int, 
+        overlap_size: int,
+        sentence_lengths: Optional[List[int]] = None
+    ) -> List[str]:
         """
         获取重叠句子
         
@@ -223,23 +304,27 @@ class SemanticChunker(BaseChunker):
             sentences: 句子列表
             start_idx: 当前块起始索引
             overlap_size: 重叠大小（字符数或 token 数，取决于 length_type）
+            sentence_lengths: 预先计算的句子长度列表（可选）
             
         Returns:
             重叠句子列表
         """
-        overlap_sentences = []
         current_size = 0
+        overlap_start = start_idx
         
+        # 从当前块起点向前累加，找到重叠区间的起始位置
         for i in range(start_idx - 1, -1, -1):
-            sentence = sentences[i]
-            sentence_length = self._length_function(sentence)
+            if sentence_lengths is not None:
+                sentence_length = sentence_lengths[i]
+            else:
+                sentence_length = self._length_function(sentences[i])
             if current_size + sentence_length <= overlap_size:
-                overlap_sentences.insert(0, sentence)
+                overlap_start = i
                 current_size += sentence_length
             else:
                 break
         
-        return overlap_sentences
+        return sentences[overlap_start:start_idx]
     
     def chunk(self, markdown_text: str) -> List[str]:
         """
@@ -254,6 +339,57 @@ class SemanticChunker(BaseChunker):
         if not markdown_text.strip():
             return []
         
+        if self.cache_size <= 0:
+            return self._chunk(markdown_text)
+        
+        # 按文本哈希和切分参数查找缓存，构造后修改参数不会返回旧结果
+        key = (
+            hashlib.blake2b(markdown_text.encode('utf-8'), digest_size=16).digest(),
+            self.config,
+            self.similarity_threshold,
+            self.min_chunk_size
+        )
+        with self._cache_lock:
+            cached = self._chunk_cache.get(key)
+            if cached is not None:
+                self._chunk_cache.move_to_end(key)
+                return list(cached)
+        
+        chunks = self._chunk(markdown_text)
+        
+        with self._cache_lock:
+            self._chunk_cache[key] = tuple(chunks)
+            while len(self._chunk_cache) > self.cache_size:
+                self._chunk_cache.popitem(last=False)
+        
+        return chunks
+    
+    def clear_cache(self):
+        """清空切块结果缓存和句子向量缓存"""
+        with self._cache_lock:
+            self._chunk_cache.clear()
+            self._embedding_cache.clear()
+    
+    def __getstate__(self):
+        # 锁无法序列化，chunk_batch(use_processes=True) 时在子进程中重建
+        state = self.__dict__.copy()
+        del state['_cache_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache_lock = threading.Lock()
+    
+    def _chunk(self, markdown_text: str) -> List[str]:
+        """
+        执行语义切分（不经过缓存）
+        
+        Args:
+            markdown_text: 输入的 Markdown 文本
+            
+        Returns:
+            切块后的文本列表
+        """
         # 分割成句子
         sentences = self._split_into_sentences(markdown_text)
         
@@ -261,13 +397,21 @@ class SemanticChunker(BaseChunker):
             # 只有一个句子，直接返回
             return [markdown_text]
         
-        # 计算相似度矩阵
-        similarity_matrix = self._calculate_similarity_matrix(sentences)
+        # 每个句子的长度只计算一次，供切分点和重叠计算共用
+        sentence_lengths = [self._length_function(sentence) for sentence in sentences]
+        
+        # 首句之后的累计长度达不到最小块大小时不可能产生切分点，
+        # 直接合并为一个块，无需调用 embedding
+        if sum(sentence_lengths) - sentence_lengths[0] < self.min_chunk_size:
+            return ["".join(sentences)]
+        
+        # 获取句子嵌入（连续内存的 float32 矩阵）
+        embeddings = self._embed_sentences(sentences)
         
         # 找到切分点
-        breakpoints = self._find_breakpoints(sentences, similarity_matrix)
+        breakpoints = self._find_breakpoints(sentences, embeddings, sentence_lengths)
         
         # 创建文本块
-        chunks = self._create_chunks_from_breakpoints(sentences, breakpoints)
+        chunks = self._create_chunks_from_breakpoints(sentences, breakpoints, sentence_lengths)
         
         return chunks
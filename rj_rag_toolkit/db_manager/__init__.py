@@ -9,10 +9,32 @@
 提供向量数据库和文档数据库的管理功能。
 """
 
-from .base_db_manager import BaseDBManager
-from .chroma_manager import ChromaManager
+import importlib
+
+# 延迟导入映射: 导出名 -> 所在模块
+# chromadb 导入开销较大，仅在使用 ChromaManager 时加载
+_LAZY_IMPORTS = {
+    "BaseDBManager": ".base_db_manager",
+    "ChromaManager": ".chroma_manager",
+    "FAISSManager": ".faiss_manager",
+}
 
 __all__ = [
     "BaseDBManager",
-    "ChromaManager"
+    "ChromaManager",
+    "FAISSManager"
 ]
+
+
+def __getattr__(name):
+    """按需导入导出对象 (PEP 562)"""
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -10,7 +10,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Optional, Union
 
 
 class BaseDBManager(ABC):
@@ -19,6 +19,15 @@ class BaseDBManager(ABC):
     定义所有数据库管理器必须实现的接口。
     """
     
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """初始化数据库管理器
+        
+        Args:
+            config: 配置参数
+        """
+        self.config = config or {}
+        self.is_connected = False
+    
     @abstractmethod
     def connect(self) -> bool:
         """连接数据库
@@ -146,6 +155,27 @@ class BaseDBManager(ABC):
         """
         pass
     
+    def search_batch(self, 
+                    collection_name: str,
+                    queries: List[Union[str, List[float]]],
+                    top_k: int = 10,
+                    **kwargs) -> List[List[Dict[str, Any]]]:
+        """批量搜索文档
+        
+        默认逐条调用 search，支持批量查询的子类应重写此方法，
+        一次完成所有查询的嵌入和索引检索。
+        
+        Args:
+            collection_name: 集合名称
+            queries: 查询内容或向量列表
+            top_k: 每个查询返回的结果数量
+            **kwargs: 其他参数
+            
+        Returns:
+            与 queries 顺序一致的搜索结果列表
+        """
+        return [self.search(collection_name, query, top_k, **kwargs) for query in queries]
+    
     @abstractmethod
     def count(self, collection_name: str, **kwargs) -> int:
         """统计文档数量
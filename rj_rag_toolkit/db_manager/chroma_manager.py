@@ -9,6 +9,7 @@ ChromaDB管理器
 基于ChromaDB的向量数据库管理实现。
 """
 
+import logging
 import os
 import uuid
 from typing import Dict, Any, List, Optional, Union
@@ -21,6 +22,8 @@ try:
 except ImportError:
     CHROMA_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
 
 class ChromaManager(BaseDBManager):
     """ChromaDB管理器
@@ -37,6 +40,17 @@ class ChromaManager(BaseDBManager):
                 - host: 服务器地址 (HTTP客户端模式)
                 - port: 服务器端口 (HTTP客户端模式)
                 - anonymized_telemetry: 是否启用匿名遥测
+                - embedding_func: 文本嵌入函数 (可选)，接收文本列表返回向量列表，
+                  签名: func(texts: List[str]) -> List[List[float]]。
+                  提供后，add_documents 会将缺少 embedding 的文档合并为批量调用，
+                  search 的文本查询也使用该函数嵌入，不再依赖 Chroma 默认嵌入模型
+                - embedding_batch_size: 每次调用 embedding_func 的文本数量 (默认: 64)
+                - insert_batch_size: 每次写入 Chroma 的文档数量 (默认: 1000)，
+                  不超过客户端允许的最大批量
+                - hnsw_space: 新建集合的距离度量 (默认: 'cosine')，
+                  可选 'cosine'、'ip'、'l2'。search 返回的 score 为 1 - distance，
+                  在 cosine 下即为余弦相似度；已存在的集合保持创建时的度量和元数据，
+                  在 l2 / ip 集合上 score 不是余弦相似度
         """
         if not CHROMA_AVAILABLE:
             raise ImportError(
@@ -49,6 +63,10 @@ class ChromaManager(BaseDBManager):
         self.persist_directory = self.config.get('persist_directory', './chroma_db')
         self.host = self.config.get('host')
         self.port = self.config.get('port', 8000)
+        self.embedding_func = self.config.get('embedding_func')
+        self.embedding_batch_size = self.config.get('embedding_batch_size', 64)
+        self.insert_batch_size = self.config.get('insert_batch_size', 1000)
+        self.hnsw_space = self.config.get('hnsw_space', 'cosine')
         
         self.client = None
         self.collections = {}
@@ -82,7 +100,7 @@ class ChromaManager(BaseDBManager):
             return True
             
         except Exception as e:
-            print(f"连接ChromaDB失败: {str(e)}")
+            logger.error("连接ChromaDB失败: %s", e)
             self.is_connected = False
             return False
     
@@ -115,7 +133,7 @@ class ChromaManager(BaseDBManager):
             collection_name: 集合名称
             **kwargs: 其他参数
                 - embedding_function: 嵌入函数
-                - metadata: 集合元数据
+                - metadata: 集合元数据，未指定 'hnsw:space' 时使用 hnsw_space 配置
                 
         Returns:
             创建是否成功
@@ -125,7 +143,7 @@ class ChromaManager(BaseDBManager):
         
         try:
             embedding_function = kwargs.get('embedding_function')
-            metadata = kwargs.get('metadata', {})
+            metadata = self._collection_metadata(kwargs.get('metadata'))
             
             collection = self.client.create_collection(
                 name=collection_name,
@@ -137,7 +155,7 @@ class ChromaManager(BaseDBManager):
             return True
             
         except Exception as e:
-            print(f"创建集合失败 {collection_name}: {str(e)}")
+            logger.error("创建集合失败 %s: %s", collection_name, e)
             return False
     
     def get_or_create_collection(self, collection_name: str, **kwargs):
@@ -146,6 +164,9 @@ class ChromaManager(BaseDBManager):
         Args:
             collection_name: 集合名称
             **kwargs: 创建参数
+                - embedding_function: 嵌入函数
+                - metadata: 新建集合时使用的元数据，未指定 'hnsw:space' 时使用 hnsw_space 配置；
+                  集合已存在时忽略，不修改其元数据
             
         Returns:
             集合对象
@@ -155,21 +176,41 @@ class ChromaManager(BaseDBManager):
         
         try:
             embedding_function = kwargs.get('embedding_function')
-            metadata = kwargs.get('metadata', {})
             
-            collection = self.client.get_or_create_collection(
-                name=collection_name,
-                embedding_function=embedding_function,
-                metadata=metadata
-            )
+            # 先获取已存在的集合；get_or_create_collection 在元数据不同时会整体替换
+            # 已有集合的元数据（而索引度量不变），因此元数据只在新建集合时传入
+            try:
+                collection = self.client.get_collection(
+                    name=collection_name,
+                    embedding_function=embedding_function
+                )
+            except Exception:
+                collection = self.client.create_collection(
+                    name=collection_name,
+                    embedding_function=embedding_function,
+                    metadata=self._collection_metadata(kwargs.get('metadata'))
+                )
             
             self.collections[collection_name] = collection
             return collection
             
         except Exception as e:
-            print(f"获取或创建集合失败 {collection_name}: {str(e)}")
+            logger.error("获取或创建集合失败 %s: %s", collection_name, e)
             return None
     
+    def _collection_metadata(self, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """生成新建集合的元数据，默认使用 hnsw_space 指定的距离度量
+        
+        Args:
+            metadata: 用户传入的集合元数据
+            
+        Returns:
+            集合元数据
+        """
+        metadata = dict(metadata or {})
+        metadata.setdefault('hnsw:space', self.hnsw_space)
+        return metadata
+    
     def delete_collection(self, collection_name: str) -> bool:
         """删除集合
         
@@ -188,7 +229,7 @@ class ChromaManager(BaseDBManager):
             return True
             
         except Exception as e:
-            print(f"删除集合失败 {collection_name}: {str(e)}")
+            logger.error("删除集合失败 %s: %s", collection_name, e)
             return False
     
     def list_collections(self) -> List[str]:
@@ -204,7 +245,7 @@ class ChromaManager(BaseDBManager):
             collections = self.client.list_collections()
             return [col.name for col in collections]
         except Exception as e:
-            print(f"列出集合失败: {str(e)}")
+            logger.error("列出集合失败: %s", e)
             return []
     
     def add_documents(self, 
@@ -222,46 +263,109 @@ class ChromaManager(BaseDBManager):
             **kwargs: 其他参数
             
         Returns:
-            文档ID列表
+            已写入的文档ID列表。文档按 insert_batch_size 分批写入，
+            某一批写入失败时，之前的批次已写入集合，只返回这些批次的ID，
+            调用方可比较返回数量与 documents 数量判断是否部分写入
         """
         collection = self.get_or_create_collection(collection_name, **kwargs)
         if not collection:
             return []
         
+        ids = []
+        written = 0
         try:
-            # 准备数据
-            ids = []
-            contents = []
-            embeddings = []
-            metadatas = []
-            
-            for doc in documents:
-                doc_id = doc.get('id', str(uuid.uuid4()))
-                ids.append(doc_id)
-                contents.append(doc.get('content', ''))
-                
-                if 'embedding' in doc:
-                    embeddings.append(doc['embedding'])
-                
-                metadata = doc.get('metadata', {})
-                metadatas.append(metadata)
+            # 准备数据，仅在文档没有ID时才生成 uuid
+            ids = [doc['id'] if 'id' in doc else str(uuid.uuid4()) for doc in documents]
             
             # 添加到集合
             add_params = {
                 'ids': ids,
-                'documents': contents,
-                'metadatas': metadatas
+                'documents': [doc.get('content', '') for doc in documents],
+                'metadatas': self._prepare_metadatas(documents)
             }
             
-            if embeddings:
-                add_params['embeddings'] = embeddings
-            
-            collection.add(**add_params)
+            if self.embedding_func is not None:
+                add_params['embeddings'] = self._embed_documents(documents)
+            else:
+                embeddings = [doc['embedding'] for doc in documents if 'embedding' in doc]
+                if embeddings:
+                    add_params['embeddings'] = embeddings
+            
+            # 分批写入，每批使用 Chroma 原生批量插入
+            batch_size = self._get_insert_batch_size()
+            for start in range(0, len(ids), batch_size):
+                collection.add(**{
+                    key: value[start:start + batch_size]
+                    for key, value in add_params.items()
+                })
+                written = min(start + batch_size, len(ids))
             return ids
             
         except Exception as e:
-            print(f"添加文档失败 {collection_name}: {str(e)}")
-            return []
+            if written:
+                logger.error("添加文档部分失败 %s: 已写入 %d/%d 条: %s", collection_name, written, len(documents), e)
+            else:
+                logger.error("添加文档失败 %s: %s", collection_name, e)
+            return ids[:written]
+    
+    def _prepare_metadatas(self, documents: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """提取文档元数据
+        
+        Chroma 不接受空的元数据字典，空元数据以 None 传入。
+        
+        Args:
+            documents: 文档列表
+            
+        Returns:
+            与 documents 顺序一致的元数据列表
+        """
+        return [doc.get('metadata') or None for doc in documents]
+    
+    def _get_insert_batch_size(self) -> int:
+        """获取单次写入的文档数量
+        
+        Returns:
+            insert_batch_size 与客户端最大批量中的较小值
+        """
+        batch_size = max(1, self.insert_batch_size)
+        
+        get_max_batch_size = getattr(self.client, 'get_max_batch_size', None)
+        if get_max_batch_size is not None:
+            try:
+                batch_size = min(batch_size, get_max_batch_size())
+            except Exception:
+                pass
+        
+        return batch_size
+    
+    def _embed_documents(self, documents: List[Dict[str, Any]]) -> List[List[float]]:
+        """为文档生成向量
+        
+        已带 embedding 的文档直接复用，其余文档按内容长度排序后
+        以 embedding_batch_size 为单位分批调用 embedding_func，
+        使同一批次内文本长度相近，减少模型端的 padding 计算。
+        
+        Args:
+            documents: 文档列表
+            
+        Returns:
+            与 documents 顺序一致的向量列表
+        """
+        embeddings = [doc.get('embedding') for doc in documents]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        
+        # 按长度稳定排序，同一文档的相邻块保持原有相对顺序
+        missing.sort(key=lambda i: len(documents[i].get('content', '')))
+        
+        batch_size = max(1, self.embedding_batch_size)
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            texts = [documents[i].get('content', '') for i in batch]
+            # 写回原始位置
+            for i, embedding in zip(batch, self.embedding_func(texts)):
+                embeddings[i] = embedding
+        
+        return embeddings
     
     def update_documents(self, 
                         collection_name: str,
@@ -269,6 +373,9 @@ class ChromaManager(BaseDBManager):
                         **kwargs) -> bool:
         """更新文档
         
+        文档按 insert_batch_size 分批更新。某一批失败时返回 False，
+        之前的批次已更新且不会回滚；更新是幂等的，可直接用同一批文档重试。
+        
         Args:
             collection_name: 集合名称
             documents: 文档列表
@@ -281,41 +388,45 @@ class ChromaManager(BaseDBManager):
         if not collection:
             return False
         
+        updated = 0
         try:
-            # 准备数据
-            ids = []
-            contents = []
-            embeddings = []
-            metadatas = []
-            
-            for doc in documents:
-                if 'id' not in doc:
-                    continue
-                
-                ids.append(doc['id'])
-                contents.append(doc.get('content', ''))
-                
-                if 'embedding' in doc:
-                    embeddings.append(doc['embedding'])
-                
-                metadata = doc.get('metadata', {})
-                metadatas.append(metadata)
+            # 没有 ID 的文档无法更新
+            documents = [doc for doc in documents if 'id' in doc]
+            
+            ids = [doc['id'] for doc in documents]
             
             # 更新集合
             update_params = {
                 'ids': ids,
-                'documents': contents,
-                'metadatas': metadatas
+                'documents': [doc.get('content', '') for doc in documents],
+                'metadatas': self._prepare_metadatas(documents)
             }
             
-            if embeddings:
-                update_params['embeddings'] = embeddings
-            
-            collection.update(**update_params)
+            if self.embedding_func is not None:
+                update_params['embeddings'] = self._embed_documents(documents)
+            else:
+                embeddings = [doc['embedding'] for doc in documents if 'embedding' in doc]
+                if embeddings:
+                    update_params['embeddings'] = embeddings
+            
+            # 分批更新，与 add_documents 使用相同的批量大小
+            batch_size = self._get_insert_batch_size()
+            for start in range(0, len(ids), batch_size):
+                collection.update(**{
+                    key: value[start:start + batch_size]
+                    for key, value in update_params.items()
+                })
+                updated = min(start + batch_size, len(ids))
             return True
             
         except Exception as e:
-            print(f"更新文档失败 {collection_name}: {str(e)}")
+            if updated:
+                logger.error(
+                    "更新文档部分失败 %s: 前 %d/%d 条已更新，首个未更新的ID: %s: %s",
+                    collection_name, updated, len(ids), ids[updated], e
+                )
+            else:
+                logger.error("更新文档失败 %s: %s", collection_name, e)
             return False
     
     def delete_documents(self, 
@@ -341,7 +452,7 @@ class ChromaManager(BaseDBManager):
             return True
             
         except Exception as e:
-            print(f"删除文档失败 {collection_name}: {str(e)}")
+            logger.error("删除文档失败 %s: %s", collection_name, e)
             return False
     
     def search(self, 
@@ -373,7 +484,10 @@ class ChromaManager(BaseDBManager):
                 'include': ['documents', 'metadatas', 'distances']
             }
             
-            if isinstance(query, str):
+            if isinstance(query, str) and self.embedding_func is not None:
+                # 使用与入库一致的 embedding_func，避免回退到 Chroma 默认嵌入模型
+                query_params['query_embeddings'] = self.embedding_func([query])
+            elif isinstance(query, str):
                 query_params['query_texts'] = [query]
             else:
                 query_params['query_embeddings'] = [query]
@@ -388,24 +502,101 @@ class ChromaManager(BaseDBManager):
             # 执行查询
             results = collection.query(**query_params)
             
-            # 格式化结果
-            formatted_results = []
-            if results['ids'] and len(results['ids']) > 0:
-                for i in range(len(results['ids'][0])):
-                    result = {
-                        'id': results['ids'][0][i],
-                        'content': results['documents'][0][i] if results['documents'] else '',
-                        'metadata': results['metadatas'][0][i] if results['metadatas'] else {},
-                        'score': 1 - results['distances'][0][i] if results['distances'] else 0.0  # 转换为相似度
-                    }
-                    formatted_results.append(result)
-            
-            return formatted_results
+            if not results['ids']:
+                return []
+            return self._format_query_results(results, 0)
             
         except Exception as e:
-            print(f"搜索失败 {collection_name}: {str(e)}")
+            logger.error("搜索失败 %s: %s", collection_name, e)
             return []
     
+    def search_batch(self, 
+                    collection_name: str,
+                    queries: List[Union[str, List[float]]],
+                    top_k: int = 10,
+                    **kwargs) -> List[List[Dict[str, Any]]]:
+        """批量搜索文档
+        
+        所有查询合并为一次 embedding_func 调用和一次 collection.query，
+        由 Chroma 在同一次索引访问中完成检索。
+        
+        Args:
+            collection_name: 集合名称
+            queries: 查询内容或向量列表，需全部为文本或全部为向量
+            top_k: 每个查询返回的结果数量
+            **kwargs: 其他参数
+                - where: 元数据过滤条件
+                - where_document: 文档内容过滤条件
+                
+        Returns:
+            与 queries 顺序一致的搜索结果列表
+        """
+        if len(queries) <= 1:
+            return [self.search(collection_name, query, top_k, **kwargs) for query in queries]
+        
+        collection = self.get_or_create_collection(collection_name, **kwargs)
+        if not collection:
+            return [[] for _ in queries]
+        
+        try:
+            # 构建查询参数
+            query_params = {
+                'n_results': top_k,
+                'include': ['documents', 'metadatas', 'distances']
+            }
+            
+            text_queries = [query for query in queries if isinstance(query, str)]
+            if text_queries and len(text_queries) != len(queries):
+                # 文本与向量混合时逐条查询
+                return [self.search(collection_name, query, top_k, **kwargs) for query in queries]
+            
+            if text_queries and self.embedding_func is not None:
+                query_params['query_embeddings'] = self.embedding_func(text_queries)
+            elif text_queries:
+                query_params['query_texts'] = text_queries
+            else:
+                query_params['query_embeddings'] = queries
+            
+            # 添加过滤条件
+            if 'where' in kwargs:
+                query_params['where'] = kwargs['where']
+            
+            if 'where_document' in kwargs:
+                query_params['where_document'] = kwargs['where_document']
+            
+            # 执行查询
+            results = collection.query(**query_params)
+            
+            if not results['ids']:
+                return [[] for _ in queries]
+            return [self._format_query_results(results, row) for row in range(len(queries))]
+            
+        except Exception as e:
+            logger.error("批量搜索失败 %s: %s", collection_name, e)
+            return [[] for _ in queries]
+    
+    def _format_query_results(self, results: Dict[str, Any], row: int) -> List[Dict[str, Any]]:
+        """格式化 collection.query 中第 row 个查询的结果
+        
+        Args:
+            results: collection.query 的返回值
+            row: 查询序号
+            
+        Returns:
+            搜索结果列表
+        """
+        formatted_results = []
+        for i in range(len(results['ids'][row])):
+            result = {
+                'id': results['ids'][row][i],
+                'content': results['documents'][row][i] if results['documents'] else '',
+                'metadata': (results['metadatas'][row][i] if results['metadatas'] else None) or {},
+                'score': 1 - results['distances'][row][i] if results['distances'] else 0.0  # 转换为相似度
+            }
+            formatted_results.append(result)
+        
+        return formatted_results
+    
     def count(self, collection_name: str, **kwargs) -> int:
         """统计文档数量
         
@@ -423,5 +614,5 @@ class ChromaManager(BaseDBManager):
         try:
             return collection.count()
         except Exception as e:
-            print(f"统计文档数量失败 {collection_name}: {str(e)}")
+            logger.error("统计文档数量失败 %s: %s", collection_name, e)
             return 0
@@ -0,0 +1,774 @@
+# ┌──────────────────────────────┐
+# │ Author:  Renjie Wang         │
+# │ Created: Wed Oct 29 2025     │
+# └──────────────────────────────┘
+
+"""
+FAISS管理器
+
+基于FAISS的向量数据库管理实现。
+适用于百万级以上的大规模向量，支持 IVF / PQ 等压缩索引。
+"""
+
+import json
+import logging
+import os
+import shutil
+import uuid
+from typing import Dict, Any, List, Optional, Union
+
+import numpy as np
+from .base_db_manager import BaseDBManager
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class FAISSManager(BaseDBManager):
+    """FAISS管理器
+    
+    提供基于FAISS的向量数据库管理功能。
+    每个集合对应一个 FAISS 索引文件和一个保存文档内容、元数据的 JSON 文件，
+    向量在索引中以整数 ID 存储，通过 ID 映射回文档。
+    """
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """初始化FAISS管理器
+        
+        Args:
+            config: 配置参数，支持以下选项：
+                - persist_directory: 数据持久化目录 (默认: './faiss_db')
+                - embedding_func: 文本嵌入函数 (可选)，接收文本列表返回向量列表，
+                  签名: func(texts: List[str]) -> List[List[float]]。
+                  未提供时，文档必须自带 embedding，查询必须传入向量
+                - embedding_batch_size: 每次调用 embedding_func 的文本数量 (默认: 64)
+                - index_factory: FAISS 索引描述字符串 (默认: 'Flat')
+                    - 'Flat': float32 精确检索
+                    - 'SQfp16': 以 float16 存储向量，索引内存减半，检索结果与 Flat 基本一致
+                    - 'IVF1024,PQ16': 大规模数据使用的压缩索引
+                  HNSW、NSG 等不支持删除向量的索引无法使用，首次写入时报错
+                - metric: 距离度量 (默认: 'cosine')
+                    - 'cosine': 余弦相似度（向量归一化后做内积）
+                    - 'ip': 内积
+                    - 'l2': 欧氏距离
+                - train_size: 训练 IVF / PQ 索引时使用的最大样本数 (默认: 100000)。
+                  需要训练的索引只在首次 add_documents 时用该批向量训练一次，
+                  之后的批次不会重新训练，因此首次写入应是有代表性的大批量数据：
+                  少于 nlist 或 PQ 的 256 个聚类中心时写入失败，
+                  少于其 39 倍时记录告警，召回率会下降
+                - nprobe: IVF 索引查询时访问的聚类数 (默认: 10)
+                - refine: 是否额外保存原始向量用于精排 (默认: False)。
+                  开启后先在压缩索引中召回 top_k * refine_k_factor 个候选，
+                  再用原始向量计算精确得分并取前 top_k 个，弥补 PQ 量化带来的召回损失；
+                  会额外占用 n * d * 4 字节内存。
+                  FAISS 自带的 'RFlat' 后缀不支持删除向量，应使用此选项代替；
+                  压缩索引与原始向量使用相同的整数 ID，删除和更新后精排结果保持一致
+                - refine_k_factor: 精排候选数相对 top_k 的倍数 (默认: 10)
+                - auto_persist: 每次写操作后是否立即保存到磁盘 (默认: True)，
+                  批量导入时可关闭，完成后调用 persist() 或 disconnect() 保存
+        """
+        if not FAISS_AVAILABLE:
+            raise ImportError(
+                "faiss is required for FAISSManager. "
+                "Install it with: pip install faiss-cpu"
+            )
+        
+        super().__init__(config)
+        
+        self.persist_directory = self.config.get('persist_directory', './faiss_db')
+        self.embedding_func = self.config.get('embedding_func')
+        self.embedding_batch_size = self.config.get('embedding_batch_size', 64)
+        self.index_factory = self.config.get('index_factory', 'Flat')
+        self.metric = self.config.get('metric', 'cosine')
+        self.train_size = self.config.get('train_size', 100000)
+        self.nprobe = self.config.get('nprobe', 10)
+        self.refine = self.config.get('refine', False)
+        self.refine_k_factor = self.config.get('refine_k_factor', 10)
+        self.auto_persist = self.config.get('auto_persist', True)
+        
+        if self.metric not in ('cosine', 'ip', 'l2'):
+            raise ValueError(f"不支持的 metric: {self.metric}，仅支持 'cosine'、'ip' 或 'l2'")
+        
+        self.collections = {}
+    
+    def connect(self) -> bool:
+        """连接FAISS（准备持久化目录）
+        
+        Returns:
+            连接是否成功
+        """
+        try:
+            os.makedirs(self.persist_directory, exist_ok=True)
+            self.is_connected = True
+            return True
+        
+        except Exception as e:
+            logger.error("连接FAISS失败: %s", e)
+            self.is_connected = False
+            return False
+    
+    def disconnect(self):
+        """断开FAISS连接，保存所有已加载的集合"""
+        if self.is_connected:
+            self.persist()
+            self.collections.clear()
+            self.is_connected = False
+    
+    def is_healthy(self) -> bool:
+        """检查FAISS健康状态
+        
+        Returns:
+            数据库是否健康
+        """
+        return self.is_connected and os.path.isdir(self.persist_directory)
+    
+    def create_collection(self, collection_name: str, **kwargs) -> bool:
+        """创建集合
+        
+        Args:
+            collection_name: 集合名称
+            **kwargs: 其他参数
+                - index_factory: 该集合使用的索引描述字符串，默认使用配置值
+                - metric: 该集合使用的距离度量，默认使用配置值
+                - refine: 该集合是否保存原始向量用于精排，默认使用配置值
+                - metadata: 集合元数据
+        
+        Returns:
+            创建是否成功
+        """
+        if not self.is_connected:
+            return False
+        
+        if collection_name in self.list_collections():
+            logger.error("创建集合失败 %s: 集合已存在", collection_name)
+            return False
+        
+        try:
+            collection = self._new_collection(**kwargs)
+            self._save_collection(collection_name, collection)
+            self.collections[collection_name] = collection
+            return True
+        
+        except Exception as e:
+            logger.error("创建集合失败 %s: %s", collection_name, e)
+            return False
+    
+    def get_or_create_collection(self, collection_name: str, **kwargs):
+        """获取或创建集合
+        
+        Args:
+            collection_name: 集合名称
+            **kwargs: 创建参数
+        
+        Returns:
+            集合对象
+        """
+        if collection_name in self.collections:
+            return self.collections[collection_name]
+        
+        if not self.is_connected:
+            return None
+        
+        try:
+            collection = self._load_collection(collection_name)
+            if collection is None:
+                collection = self._new_collection(**kwargs)
+            
+            self.collections[collection_name] = collection
+            return collection
+        
+        except Exception as e:
+            logger.error("获取或创建集合失败 %s: %s", collection_name, e)
+            return None
+    
+    def delete_collection(self, collection_name: str) -> bool:
+        """删除集合
+        
+        Args:
+            collection_name: 集合名称
+        
+        Returns:
+            删除是否成功
+        """
+        if not self.is_connected:
+            return False
+        
+        try:
+            self.collections.pop(collection_name, None)
+            collection_dir = self._collection_dir(collection_name)
+            if os.path.isdir(collection_dir):
+                shutil.rmtree(collection_dir)
+            return True
+        
+        except Exception as e:
+            logger.error("删除集合失败 %s: %s", collection_name, e)
+            return False
+    
+    def list_collections(self) -> List[str]:
+        """列出所有集合
+        
+        Returns:
+            集合名称列表
+        """
+        if not self.is_connected:
+            return []
+        
+        try:
+            names = set(self.collections)
+            for name in os.listdir(self.persist_directory):
+                if os.path.isfile(os.path.join(self.persist_directory, name, 'documents.json')):
+                    names.add(name)
+            return sorted(names)
+        except Exception as e:
+            logger.error("列出集合失败: %s", e)
+            return []
+    
+    def add_documents(self,
+                     collection_name: str,
+                     documents: List[Dict[str, Any]],
+                     **kwargs) -> List[str]:
+        """添加文档
+        
+        Args:
+            collection_name: 集合名称
+            documents: 文档列表，每个文档应包含：
+                - content: 文档内容
+                - metadata: 元数据 (可选)
+                - embedding: 向量 (可选，未配置 embedding_func 时必需)
+                - id: 文档ID (可选)，已存在的ID会被覆盖
+            **kwargs: 其他参数
+        
+        Returns:
+            文档ID列表
+        """
+        collection = self.get_or_create_collection(collection_name, **kwargs)
+        if collection is None:
+            return []
+        
+        try:
+            ids = [doc['id'] if 'id' in doc else str(uuid.uuid4()) for doc in documents]
+            if len(set(ids)) != len(ids):
+                raise ValueError("同一批次中存在重复的文档ID")
+            vectors = self._to_vectors(self._embed_documents(documents), collection['metric'])
+            
+            # 首次写入时按向量维度构建索引，IVF / PQ 索引需先训练
+            if collection['index'] is None:
+                collection['index'] = self._build_index(collection, vectors.shape[1])
+                if collection['refine']:
+                    collection['refine_index'] = self._build_index(collection, vectors.shape[1], 'Flat')
+            index = collection['index']
+            self._check_dimension(collection, vectors)
+            if not index.is_trained:
+                # 索引只在首次写入时训练一次，之后的批次不会重新训练
+                min_size, recommended_size = self._train_size_bounds(index)
+                if len(vectors) < min_size:
+                    raise ValueError(
+                        f"索引 {collection['index_factory']} 至少需要 {min_size} 条向量训练，"
+                        f"首次写入仅有 {len(vectors)} 条"
+                    )
+                if len(vectors) < recommended_size:
+                    logger.warning(
+                        "索引 %s 建议使用至少 %d 条向量训练，首次写入仅有 %d 条，召回率可能下降",
+                        collection['index_factory'], recommended_size, len(vectors)
+                    )
+                sample = vectors
+                if len(vectors) > self.train_size:
+                    rng = np.random.default_rng(0)
+                    sample = vectors[rng.choice(len(vectors), self.train_size, replace=False)]
+                index.train(sample)
+            
+            # 已存在的ID先移除旧向量
+            self._remove_ids(collection, [doc_id for doc_id in ids if doc_id in collection['id_map']])
+            
+            int_ids = np.arange(
+                collection['next_id'], collection['next_id'] + len(ids), dtype=np.int64
+            )
+            collection['next_id'] += len(ids)
+            self._add_vectors(collection, vectors, int_ids)
+            
+            for doc_id, int_id, doc in zip(ids, int_ids.tolist(), documents):
+                collection['id_map'][doc_id] = int_id
+                collection['documents'][int_id] = {
+                    'id': doc_id,
+                    'content': doc.get('content', ''),
+                    'metadata': doc.get('metadata', {})
+                }
+            
+            self._auto_persist(collection_name, collection)
+            return ids
+        
+        except Exception as e:
+            logger.error("添加文档失败 %s: %s", collection_name, e)
+            return []
+    
+    def _embed_documents(self, documents: List[Dict[str, Any]]) -> List[List[float]]:
+        """为文档生成向量
+        
+        已带 embedding 的文档直接复用，其余文档按内容长度排序后
+        以 embedding_batch_size 为单位分批调用 embedding_func。
+        
+        Args:
+            documents: 文档列表
+        
+        Returns:
+            与 documents 顺序一致的向量列表
+        
+        Raises:
+            ValueError: 文档缺少 embedding 且未配置 embedding_func
+        """
+        embeddings = [doc.get('embedding') for doc in documents]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if not missing:
+            return embeddings
+        
+        if self.embedding_func is None:
+            raise ValueError("文档缺少 embedding，且未配置 embedding_func")
+        
+        # 按长度稳定排序，减少模型端的 padding 计算
+        missing.sort(key=lambda i: len(documents[i].get('content', '')))
+        
+        batch_size = max(1, self.embedding_batch_size)
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            texts = [documents[i].get('content', '') for i in batch]
+            # 写回原始位置
+            for i, embedding in zip(batch, self.embedding_func(texts)):
+                embeddings[i] = embedding
+        
+        return embeddings
+    
+    def update_documents(self,
+                        collection_name: str,
+                        documents: List[Dict[str, Any]],
+                        **kwargs) -> bool:
+        """更新文档
+        
+        内容或元数据直接更新；提供了 embedding 或配置了 embedding_func 时同时更新向量。
+        不存在的文档ID会被忽略。
+        
+        Args:
+            collection_name: 集合名称
+            documents: 文档列表
+            **kwargs: 其他参数
+        
+        Returns:
+            更新是否成功
+        """
+        collection = self.get_or_create_collection(collection_name, **kwargs)
+        if collection is None:
+            return False
+        
+        try:
+            documents = [doc for doc in documents if doc.get('id') in collection['id_map']]
+            if not documents:
+                return True
+            
+            # 需要重新写入向量的文档
+            reembed = [
+                doc for doc in documents
+                if 'embedding' in doc or (self.embedding_func is not None and 'content' in doc)
+            ]
+            
+            # 先更新向量，成功后再写入内容和元数据，失败时不会出现新文本对应旧向量
+            if reembed:
+                vectors = self._to_vectors(self._embed_documents(reembed), collection['metric'])
+                self._check_dimension(collection, vectors)
+                int_ids = np.array([collection['id_map'][doc['id']] for doc in reembed], dtype=np.int64)
+                self._remove_vectors(collection, int_ids)
+                self._add_vectors(collection, vectors, int_ids)
+            
+            for doc in documents:
+                stored = collection['documents'][collection['id_map'][doc['id']]]
+                if 'content' in doc:
+                    stored['content'] = doc['content']
+                if 'metadata' in doc:
+                    stored['metadata'] = doc['metadata']
+            
+            self._auto_persist(collection_name, collection)
+            return True
+        
+        except Exception as e:
+            logger.error("更新文档失败 %s: %s", collection_name, e)
+            return False
+    
+    def delete_documents(self,
+                        collection_name: str,
+                        document_ids: List[str],
+                        **kwargs) -> bool:
+        """删除文档
+        
+        Args:
+            collection_name: 集合名称
+            document_ids: 文档ID列表
+            **kwargs: 其他参数
+        
+        Returns:
+            删除是否成功
+        """
+        collection = self.get_or_create_collection(collection_name, **kwargs)
+        if collection is None:
+            return False
+        
+        try:
+            self._remove_ids(collection, [doc_id for doc_id in document_ids if doc_id in collection['id_map']])
+            self._auto_persist(collection_name, collection)
+            return True
+        
+        except Exception as e:
+            logger.error("删除文档失败 %s: %s", collection_name, e)
+            return False
+    
+    def search(self,
+              collection_name: str,
+              query: Union[str, List[float]],
+              top_k: int = 10,
+              **kwargs) -> List[Dict[str, Any]]:
+        """搜索文档
+        
+        Args:
+            collection_name: 集合名称
+            query: 查询内容或向量，传入文本时需要配置 embedding_func
+            top_k: 返回结果数量
+            **kwargs: 其他参数
+                - nprobe: IVF 索引查询时访问的聚类数，默认使用配置值
+                - refine_k_factor: 精排候选数相对 top_k 的倍数，默认使用配置值
+        
+        Returns:
+            搜索结果列表
+        """
+        return self.search_batch(collection_name, [query], top_k, **kwargs)[0]
+    
+    def search_batch(self,
+                    collection_name: str,
+                    queries: List[Union[str, List[float]]],
+                    top_k: int = 10,
+                    **kwargs) -> List[List[Dict[str, Any]]]:
+        """批量搜索文档
+        
+        文本查询合并为一次 embedding_func 调用，
+        所有查询向量组成矩阵后一次调用 index.search。
+        
+        Args:
+            collection_name: 集合名称
+            queries: 查询内容或向量列表，传入文本时需要配置 embedding_func
+            top_k: 每个查询返回的结果数量
+            **kwargs: 其他参数
+                - nprobe: IVF 索引查询时访问的聚类数，默认使用配置值
+                - refine_k_factor: 精排候选数相对 top_k 的倍数，默认使用配置值
+        
+        Returns:
+            与 queries 顺序一致的搜索结果列表
+        """
+        collection = self.get_or_create_collection(collection_name, **kwargs)
+        if collection is None or not queries:
+            return [[] for _ in queries]
+        
+        try:
+            if collection['index'] is None or not collection['documents']:
+                return [[] for _ in queries]
+            
+            # 文本查询一次性嵌入后写回原始位置
+            query_vectors = list(queries)
+            text_positions = [i for i, query in enumerate(queries) if isinstance(query, str)]
+            if text_positions:
+                if self.embedding_func is None:
+                    raise ValueError("文本查询需要配置 embedding_func")
+                text_embeddings = self.embedding_func([queries[i] for i in text_positions])
+                for i, embedding in zip(text_positions, text_embeddings):
+                    query_vectors[i] = embedding
+            query_vectors = self._to_vectors(query_vectors, collection['metric'])
+            
+            index = collection['index']
+            self._set_nprobe(index, kwargs.get('nprobe', self.nprobe))
+            k = min(top_k, index.ntotal)
+            if k <= 0:
+                return [[] for _ in queries]
+            
+            if collection['refine_index'] is not None:
+                if collection['refine_index'].ntotal != index.ntotal:
+                    raise ValueError("压缩索引与精排向量数量不一致，请重建集合")
+                # 两阶段检索：压缩索引召回候选，原始向量精排
+                k_factor = max(1, kwargs.get('refine_k_factor', self.refine_k_factor))
+                _, candidate_ids = index.search(query_vectors, min(k * k_factor, index.ntotal))
+                scores, int_ids = self._refine(collection, query_vectors, candidate_ids, k)
+            else:
+                scores, int_ids = index.search(query_vectors, k)
+                scores, int_ids = scores.tolist(), int_ids.tolist()
+            
+            # 格式化结果
+            all_results = []
+            for row_scores, row_ids in zip(scores, int_ids):
+                formatted_results = []
+                for score, int_id in zip(row_scores, row_ids):
+                    if int_id < 0:
+                        continue
+                    stored = collection['documents'][int_id]
+                    formatted_results.append({
+                        'id': stored['id'],
+                        'content': stored['content'],
+                        'metadata': stored['metadata'],
+                        # l2 为距离，与 ChromaManager 一致转换为相似度
+                        'score': 1 - score if collection['metric'] == 'l2' else score
+                    })
+                all_results.append(formatted_results)
+            
+            return all_results
+        
+        except Exception as e:
+            logger.error("搜索失败 %s: %s", collection_name, e)
+            return [[] for _ in queries]
+    
+    def count(self, collection_name: str, **kwargs) -> int:
+        """统计文档数量
+        
+        Args:
+            collection_name: 集合名称
+            **kwargs: 过滤条件
+        
+        Returns:
+            文档数量
+        """
+        collection = self.get_or_create_collection(collection_name, **kwargs)
+        if collection is None:
+            return 0
+        
+        return len(collection['documents'])
+    
+    def persist(self, collection_name: Optional[str] = None):
+        """将集合保存到磁盘
+        
+        Args:
+            collection_name: 集合名称，默认保存所有已加载的集合
+        """
+        names = [collection_name] if collection_name else list(self.collections)
+        for name in names:
+            if name in self.collections:
+                try:
+                    self._save_collection(name, self.collections[name])
+                except Exception as e:
+                    logger.error("保存集合失败 %s: %s", name, e)
+    
+    def _new_collection(self, **kwargs) -> Dict[str, Any]:
+        """创建空集合，索引在首次写入时按向量维度构建"""
+        metric = kwargs.get('metric', self.metric)
+        if metric not in ('cosine', 'ip', 'l2'):
+            raise ValueError(f"不支持的 metric: {metric}，仅支持 'cosine'、'ip' 或 'l2'")
+        
+        return {
+            'index': None,
+            'refine_index': None,
+            'index_factory': kwargs.get('index_factory', self.index_factory),
+            'metric': metric,
+            'refine': kwargs.get('refine', self.refine),
+            'metadata': kwargs.get('metadata', {}),
+            'documents': {},
+            'id_map': {},
+            'next_id': 0
+        }
+    
+    def _build_index(self, collection: Dict[str, Any], dimension: int, index_factory: Optional[str] = None):
+        """按集合配置构建 FAISS 索引
+        
+        Args:
+            collection: 集合对象
+            dimension: 向量维度
+            index_factory: 索引描述字符串，默认使用集合配置
+        
+        Returns:
+            支持按整数 ID 写入和删除的 FAISS 索引
+        
+        Raises:
+            ValueError: 索引不支持删除向量
+        """
+        index_factory = index_factory or collection['index_factory']
+        metric_type = faiss.METRIC_L2 if collection['metric'] == 'l2' else faiss.METRIC_INNER_PRODUCT
+        index = faiss.index_factory(dimension, index_factory, metric_type)
+        # IVF 索引在倒排表中直接保存 ID，必须使用原生的 add_with_ids / remove_ids；
+        # 包装为 IDMap 后删除会压缩映射表而倒排表中的 ID 不变，导致 ID 错位
+        if faiss.try_extract_index_ivf(index) is None:
+            # Flat 等索引不支持自定义 ID，包装为 IDMap
+            index = faiss.IndexIDMap2(index)
+        
+        # 更新和删除都依赖 remove_ids，用空 ID 列表预先检查
+        try:
+            index.remove_ids(np.array([], dtype=np.int64))
+        except RuntimeError:
+            raise ValueError(f"索引 {index_factory} 不支持删除向量，无法用于 FAISSManager")
+        return index
+    
+    def _train_size_bounds(self, index):
+        """估计训练索引所需的向量数量
+        
+        IVF 的聚类数为 nlist，PQ 每个子空间的聚类数为 2 ** nbits，
+        每个聚类最少需要 1 条、建议 39 条训练向量（与 FAISS 的聚类告警一致）。
+        
+        Args:
+            index: 未训练的 FAISS 索引
+        
+        Returns:
+            (最少向量数, 建议向量数)
+        """
+        clusters = 1
+        if isinstance(index, faiss.IndexIDMap):
+            index = faiss.downcast_index(index.index)
+        if isinstance(index, faiss.IndexPreTransform):
+            for i in range(index.chain.size()):
+                # OPQ 训练旋转矩阵时内部使用 8 bit PQ
+                if isinstance(faiss.downcast_VectorTransform(index.chain.at(i)), faiss.OPQMatrix):
+                    clusters = 256
+            index = faiss.downcast_index(index.index)
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            clusters = max(clusters, ivf.nlist)
+            index = faiss.downcast_index(ivf)
+        pq = getattr(index, 'pq', None)
+        if pq is not None:
+            clusters = max(clusters, pq.ksub)
+        return clusters, clusters * 39
+    
+    def _refine(self, collection: Dict[str, Any], query_vectors: np.ndarray, candidate_ids: np.ndarray, k: int):
+        """用原始向量为候选计算精确得分，每个查询保留前 k 个
+        
+        Args:
+            collection: 集合对象
+            query_vectors: 查询向量矩阵 (m, d)
+            candidate_ids: 压缩索引召回的候选 ID 矩阵 (m, k')，不足时以 -1 填充
+            k: 每个查询返回的结果数量
+        
+        Returns:
+            (得分列表, ID 列表)，均为每个查询一行
+        """
+        refine_index = collection['refine_index']
+        all_scores, all_ids = [], []
+        for query, row_ids in zip(query_vectors, candidate_ids):
+            row_ids = row_ids[row_ids >= 0]
+            vectors = refine_index.reconstruct_batch(row_ids)
+            if collection['metric'] == 'l2':
+                exact = ((vectors - query) ** 2).sum(axis=1)
+                order = np.argsort(exact, kind='stable')[:k]
+            else:
+                exact = vectors @ query
+                order = np.argsort(-exact, kind='stable')[:k]
+            all_scores.append(exact[order].tolist())
+            all_ids.append(row_ids[order].tolist())
+        return all_scores, all_ids
+    
+    def _add_vectors(self, collection: Dict[str, Any], vectors: np.ndarray, int_ids: np.ndarray):
+        """向索引（及精排向量索引）写入向量"""
+        collection['index'].add_with_ids(vectors, int_ids)
+        if collection['refine_index'] is not None:
+            collection['refine_index'].add_with_ids(vectors, int_ids)
+    
+    def _remove_vectors(self, collection: Dict[str, Any], int_ids: np.ndarray):
+        """从索引（及精排向量索引）删除向量"""
+        collection['index'].remove_ids(int_ids)
+        if collection['refine_index'] is not None:
+            collection['refine_index'].remove_ids(int_ids)
+    
+    def _set_nprobe(self, index, nprobe: int):
+        """设置 IVF 索引的 nprobe，非 IVF 索引忽略"""
+        try:
+            faiss.extract_index_ivf(index).nprobe = nprobe
+        except Exception:
+            pass
+    
+    def _check_dimension(self, collection: Dict[str, Any], vectors: np.ndarray):
+        """写入前检查向量维度，避免删除旧向量后新向量写入失败"""
+        if vectors.ndim != 2 or vectors.shape[1] != collection['index'].d:
+            raise ValueError(
+                f"向量维度不匹配: 集合为 {collection['index'].d} 维，传入 {vectors.shape[-1]} 维"
+            )
+    
+    def _to_vectors(self, embeddings, metric: str) -> np.ndarray:
+        """转换为 FAISS 所需的连续 float32 矩阵，cosine 度量下归一化"""
+        # 复制一份，归一化时不修改调用方传入的数组
+        vectors = np.array(embeddings, dtype=np.float32, order='C')
+        if metric == 'cosine':
+            faiss.normalize_L2(vectors)
+        return vectors
+    
+    def _remove_ids(self, collection: Dict[str, Any], document_ids: List[str]):
+        """从索引和文档表中移除文档"""
+        if not document_ids:
+            return
+        
+        # 向量删除成功后再移除映射和文档，失败时集合保持原状
+        int_ids = [collection['id_map'][doc_id] for doc_id in document_ids]
+        self._remove_vectors(collection, np.array(int_ids, dtype=np.int64))
+        for doc_id, int_id in zip(document_ids, int_ids):
+            collection['id_map'].pop(doc_id, None)
+            collection['documents'].pop(int_id, None)
+    
+    def _auto_persist(self, collection_name: str, collection: Dict[str, Any]):
+        """开启 auto_persist 时保存集合"""
+        if self.auto_persist:
+            self._save_collection(collection_name, collection)
+    
+    def _collection_dir(self, collection_name: str) -> str:
+        """集合的持久化目录
+        
+        Raises:
+            ValueError: 集合名称为空、包含路径分隔符或指向持久化目录之外
+        """
+        separators = [sep for sep in (os.sep, os.altsep) if sep]
+        if (not collection_name or collection_name in ('.', '..')
+                or any(sep in collection_name for sep in separators)):
+            raise ValueError(f"非法的集合名称: {collection_name!r}")
+        
+        collection_dir = os.path.join(self.persist_directory, collection_name)
+        # 防止绝对路径、盘符等绕过上面的检查
+        if os.path.dirname(os.path.abspath(collection_dir)) != os.path.abspath(self.persist_directory):
+            raise ValueError(f"非法的集合名称: {collection_name!r}")
+        return collection_dir
+    
+    def _save_collection(self, collection_name: str, collection: Dict[str, Any]):
+        """保存索引文件和文档 JSON 文件"""
+        collection_dir = self._collection_dir(collection_name)
+        os.makedirs(collection_dir, exist_ok=True)
+        
+        index_path = os.path.join(collection_dir, 'index.faiss')
+        if collection['index'] is not None:
+            faiss.write_index(collection['index'], index_path)
+        if collection['refine_index'] is not None:
+            faiss.write_index(collection['refine_index'], os.path.join(collection_dir, 'refine.faiss'))
+        
+        data = {
+            'index_factory': collection['index_factory'],
+            'metric': collection['metric'],
+            'refine': collection['refine'],
+            'metadata': collection['metadata'],
+            'next_id': collection['next_id'],
+            'documents': list(collection['documents'].items())
+        }
+        with open(os.path.join(collection_dir, 'documents.json'), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+    
+    def _load_collection(self, collection_name: str) -> Optional[Dict[str, Any]]:
+        """从磁盘加载集合，不存在时返回 None"""
+        collection_dir = self._collection_dir(collection_name)
+        documents_path = os.path.join(collection_dir, 'documents.json')
+        if not os.path.isfile(documents_path):
+            return None
+        
+        with open(documents_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        index_path = os.path.join(collection_dir, 'index.faiss')
+        refine_path = os.path.join(collection_dir, 'refine.faiss')
+        documents = {int_id: doc for int_id, doc in data['documents']}
+        return {
+            'index': faiss.read_index(index_path) if os.path.isfile(index_path) else None,
+            'refine_index': faiss.read_index(refine_path) if os.path.isfile(refine_path) else None,
+            'index_factory': data['index_factory'],
+            'metric': data['metric'],
+            'refine': data.get('refine', False),
+            'metadata': data['metadata'],
+            'documents': documents,
+            'id_map': {doc['id']: int_id for int_id, doc in documents.items()},
+            'next_id': data['next_id']
+        }
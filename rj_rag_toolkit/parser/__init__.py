@@ -9,12 +9,18 @@
 支持多种文档格式的解析，包括PDF、Word、EML、PPTX等。
 """
 
-from .base_parser import BaseParser
-from .pdf_parser import PDFParser
-from .docx_parser import DOCXParser
-from .eml_parser import EMLParser
-from .msg_parser import MSGParser
-from .pptx_parser import PPTXParser
+import importlib
+
+# 延迟导入映射: 导出名 -> 所在模块
+# 各解析器依赖不同（pdfplumber、python-docx、python-pptx、extract_msg 等），按需加载
+_LAZY_IMPORTS = {
+    "BaseParser": ".base_parser",
+    "PDFParser": ".pdf_parser",
+    "DOCXParser": ".docx_parser",
+    "EMLParser": ".eml_parser",
+    "MSGParser": ".msg_parser",
+    "PPTXParser": ".pptx_parser",
+}
 
 __all__ = [
     "BaseParser",
@@ -24,3 +30,17 @@ __all__ = [
     "MSGParser",
     "PPTXParser"
 ]
+
+
+def __getattr__(name):
+    """按需导入导出对象 (PEP 562)"""
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -10,10 +10,18 @@
 文件传入，Markdown格式文字传出。
 """
 
+import asyncio
+import copy
+import logging
+import os
+import pickle
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Union, Optional
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 class BaseParser(ABC):
     """
@@ -66,6 +74,100 @@ class BaseParser(ABC):
         """
         pass
     
+    async def aparse_files(
+        self,
+        file_paths: List[Union[str, Path]],
+        max_concurrency: Optional[int] = None
+    ) -> List[str]:
+        """
+        异步并发解析多个文件
+        
+        每个文件在线程池中解析，文件读取/解码的 I/O 等待可相互重叠。
+        解析器在解析过程中会修改图片目录、图片计数等实例状态，
+        因此每个文件使用解析器的浅拷贝，互不干扰。
+        
+        Args:
+            file_paths: 文件路径列表
+            max_concurrency: 最大并发数，默认 min(32, CPU核数 * 4)
+            
+        Returns:
+            与 file_paths 顺序一致的Markdown文本列表
+        """
+        if max_concurrency is None:
+            max_concurrency = min(32, (os.cpu_count() or 1) * 4)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        loop = asyncio.get_running_loop()
+        
+        async def parse_one(file_path: Union[str, Path]) -> str:
+            async with semaphore:
+                return await loop.run_in_executor(None, self._parse_file_isolated, file_path)
+        
+        return await asyncio.gather(*(parse_one(path) for path in file_paths))
+    
+    def parse_files(
+        self,
+        file_paths: List[Union[str, Path]],
+        max_workers: Optional[int] = None,
+        parallel: bool = True,
+        use_processes: bool = False
+    ) -> List[str]:
+        """
+        批量解析多个文件
+        
+        文件之间相互独立，默认使用线程池并行解析，结果顺序与输入顺序一致。
+        
+        Args:
+            file_paths: 文件路径列表
+            max_workers: 最大并发数，默认 CPU 核数
+            parallel: 是否并行解析，False 时按顺序逐个解析
+            use_processes: 是否使用进程池
+                - False: 线程池（默认），适合 OCR 等以外部调用为主的解析
+                - True: 进程池，适合 PDF/DOCX 文本提取、XML 解析等 CPU 密集操作；
+                  解析器无法序列化（如 ocr_func 为 lambda）时自动回退到线程池。
+                  Windows / macOS 以 spawn 方式启动子进程，会重新导入调用脚本，
+                  调用代码必须放在 if __name__ == "__main__": 保护下
+            
+        Returns:
+            与 file_paths 顺序一致的Markdown文本列表
+        """
+        if not file_paths:
+            return []
+        if not parallel or len(file_paths) == 1:
+            return [self._parse_file_isolated(path) for path in file_paths]
+        
+        workers = max_workers or os.cpu_count() or 1
+        
+        if use_processes:
+            try:
+                pickle.dumps(self)
+            except Exception as e:
+                logger.warning("解析器无法序列化，回退到线程池: %s", e)
+                use_processes = False
+        
+        if use_processes:
+            chunksize = max(1, len(file_paths) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(self._parse_file_isolated, file_paths, chunksize=chunksize))
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._parse_file_isolated, file_paths))
+    
+    def _parse_file_isolated(self, file_path: Union[str, Path]) -> str:
+        """
+        使用解析器的浅拷贝解析单个文件
+        
+        解析过程中会修改图片目录、图片计数等实例状态，
+        拷贝后并发或连续解析多个文件时互不干扰。
+        
+        Args:
+            file_path: 文件路径
+            
+        Returns:
+            Markdown格式的文本内容
+        """
+        return copy.copy(self).parse_file(file_path)
+    
     @abstractmethod
     def get_supported_extensions(self) -> List[str]:
         """
@@ -22,6 +22,10 @@ from io import BytesIO
 import re
 from .base_parser import BaseParser
 
+# 邮件头起始行(必须在行首，允许前导空白): **From:** / **发件人 / **寄件者
+# 三种语言合并为一个正则，整段内容只需扫描一次
+EMAIL_HEADER_START_PATTERN = re.compile(r'^(?=[^\S\n]*\*\*(?:From:\*\*|发件人|寄件者))', re.MULTILINE)
+
 
 class EMLParser(BaseParser):
     """EML 邮件解析器"""
@@ -348,29 +352,15 @@ class EMLParser(BaseParser):
             添加了邮件标记的 Markdown 内容
         """
         email_number = 2  # 从 Email 2 开始（Email 1 已在主邮件头添加）
-        lines = markdown_content.split('\n')
-        result_lines = []
         
-        for line in lines:
-            # 检测邮件头起始行(必须在行首)
-            is_email_start = False
-            stripped_line = line.lstrip()
-            
-            if stripped_line.startswith('**From:**'):
-                is_email_start = True
-            elif stripped_line.startswith('**发件人'):
-                is_email_start = True
-            elif stripped_line.startswith('**寄件者'):
-                is_email_start = True
-            
-            # 如果检测到邮件头，添加标记
-            if is_email_start:
-                result_lines.append(f"\n## Email {email_number}\n")
-                email_number += 1
-            
-            result_lines.append(line)
+        def insert_marker(match):
+            nonlocal email_number
+            marker = f"\n## Email {email_number}\n\n"
+            email_number += 1
+            return marker
         
-        return '\n'.join(result_lines)
+        # 单次扫描，在每个邮件头起始行之前插入标记
+        return EMAIL_HEADER_START_PATTERN.sub(insert_marker, markdown_content)
     
     def _extract_content_as_markdown(self, mail, embedded_images: dict, attachments_base_dir: Path) -> str:
         """
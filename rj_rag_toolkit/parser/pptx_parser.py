@@ -19,6 +19,12 @@ import base64
 import tempfile
 from .base_parser import BaseParser
 
+# 列表项识别正则（模块级预编译，避免每个形状、每一行重复查找编译缓存）
+LIST_ITEM_PATTERN = re.compile(r'^[\s]*[•●○■□▪▫◦‣⁃-]\s+|^\s*\d+[\.\)]\s+')
+BULLET_PREFIX_PATTERN = re.compile(r'^[•●○■□▪▫◦‣⁃]\s+')
+NUMBERED_PREFIX_PATTERN = re.compile(r'^(\d+)[\.\)]\s+')
+NUMBERED_ITEM_PATTERN = re.compile(r'^\d+\.\s+')
+
 
 class PPTXParser(BaseParser):
     """PowerPoint 文件解析器"""
@@ -299,8 +305,7 @@ class PPTXParser(BaseParser):
         lines = text.split('\n')
         
         # 检查是否为列表项
-        list_pattern = re.compile(r'^[\s]*[•●○■□▪▫◦‣⁃-]\s+|^\s*\d+[\.\)]\s+')
-        list_count = sum(1 for line in lines if list_pattern.match(line))
+        list_count = sum(1 for line in lines if LIST_ITEM_PATTERN.match(line))
         
         if len(lines) >= 2 and list_count >= 1:
             formatted_lines = []
@@ -308,9 +313,9 @@ class PPTXParser(BaseParser):
                 line = line.strip()
                 if not line:
                     continue
-                line = re.sub(r'^[•●○■□▪▫◦‣⁃]\s+', '- ', line)
-                line = re.sub(r'^(\d+)[\.\)]\s+', r'\1. ', line)
-                if not line.startswith(('-', '*', '+')) and not re.match(r'^\d+\.\s+', line):
+                line = BULLET_PREFIX_PATTERN.sub('- ', line)
+                line = NUMBERED_PREFIX_PATTERN.sub(r'\1. ', line)
+                if not line.startswith(('-', '*', '+')) and not NUMBERED_ITEM_PATTERN.match(line):
                     line = f"- {line}"
                 formatted_lines.append(line)
             return '\n'.join(formatted_lines) + '\n'
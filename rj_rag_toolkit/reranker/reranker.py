@@ -9,9 +9,12 @@
 对检索结果进行重排序，提高检索精度。
 """
 
+import logging
 from typing import List, Dict, Any, Optional
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
 class Reranker:
     """通用重排序器
@@ -19,13 +22,24 @@ class Reranker:
     使用重排序函数对检索结果进行重排序。
     """
     
-    def __init__(self, rerank_function):
+    def __init__(self, rerank_function=None, batch_rerank_function=None):
         """初始化重排序器
         
         Args:
             rerank_function: 重排序函数，接受 (query, doc) 返回分数
+            batch_rerank_function: 批量重排序函数（可选），接受 (query, docs) 返回分数列表。
+                                   签名: func(query: str, docs: List[str]) -> List[float]
+                                   提供后优先使用，所有文档只需一次调用，
+                                   CrossEncoder 等模型可在一次前向计算中完成打分
+        
+        Raises:
+            ValueError: 如果两个函数都未提供
         """
+        if rerank_function is None and batch_rerank_function is None:
+            raise ValueError("必须提供 rerank_function 或 batch_rerank_function")
+        
         self.rerank_function = rerank_function
+        self.batch_rerank_function = batch_rerank_function
     
     def rerank(self, 
                query: str,
@@ -60,10 +74,10 @@ class Reranker:
             contents = [chunk.get('content', '') for chunk in chunks]
             
             # 计算重排序分数
-            scores = []
-            for content in contents:
-                score = self.rerank_function(query, content)
-                scores.append(score)
+            if self.batch_rerank_function is not None:
+                scores = list(self.batch_rerank_function(query, contents))
+            else:
+                scores = [self.rerank_function(query, content) for content in contents]
             
             # 使用sigmoid归一化分数
             normalized_scores = self._normalize_scores(scores)
@@ -100,7 +114,7 @@ class Reranker:
             return results
             
         except Exception as e:
-            print(f"重排序失败: {str(e)}")
+            logger.error("重排序失败: %s", e)
             return chunks
     
     def _normalize_scores(self, scores) -> np.ndarray:
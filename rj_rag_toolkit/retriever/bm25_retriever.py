@@ -10,6 +10,8 @@ BM25检索器
 无状态设计，每次检索时传入内容块列表。
 """
 
+import logging
+import re
 from typing import Dict, Any, List, Optional
 from .base_retriever import BaseRetriever
 
@@ -19,6 +21,11 @@ try:
 except ImportError:
     BM25_AVAILABLE = False
 
+# 标点符号正则（模块级预编译）
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+
+logger = logging.getLogger(__name__)
+
 
 class BM25Retriever(BaseRetriever):
     """BM25检索器
@@ -64,16 +71,15 @@ class BM25Retriever(BaseRetriever):
                 import jieba
                 return lambda text: list(jieba.cut(text))
             except ImportError:
-                print("jieba not available, using simple tokenizer")
+                logger.warning("jieba not available, using simple tokenizer")
                 return self._simple_tokenizer
         else:
             return self._simple_tokenizer
     
     def _simple_tokenizer(self, text: str) -> List[str]:
         """简单分词器"""
-        import re
         # 移除标点符号并转换为小写
-        text = re.sub(r'[^\w\s]', ' ', text.lower())
+        text = PUNCTUATION_PATTERN.sub(' ', text.lower())
         return text.split()
     
     def retrieve(self, 
@@ -155,5 +161,5 @@ class BM25Retriever(BaseRetriever):
             return results
             
         except Exception as e:
-            print(f"BM25检索失败: {str(e)}")
+            logger.error("BM25检索失败: %s", e)
             return []
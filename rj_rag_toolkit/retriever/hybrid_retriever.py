@@ -10,11 +10,14 @@
 无状态设计，每次检索时传入内容块列表。
 """
 
+import logging
 from typing import List, Dict, Any, Optional
 from .base_retriever import BaseRetriever
 from .bm25_retriever import BM25Retriever
 from .vector_retriever import VectorRetriever
 
+logger = logging.getLogger(__name__)
+
 
 class HybridRetriever(BaseRetriever):
     """混合检索器
@@ -70,6 +73,7 @@ class HybridRetriever(BaseRetriever):
             top_k: 返回结果数量
             min_score: 最小相关性分数阈值（可选）
             **kwargs: 其他参数
+                - fetch_k: 每路检索获取的候选数量，用于融合 (默认: top_k * 2)
                 
         Returns:
             检索结果列表
@@ -77,12 +81,14 @@ class HybridRetriever(BaseRetriever):
         if not chunks:
             return []
         
+        fetch_k = kwargs.pop('fetch_k', None) or top_k * 2
+        
         try:
             # BM25检索
             bm25_results = self.bm25_retriever.retrieve(
                 query=query,
                 chunks=chunks,
-                top_k=top_k * 2,  # 获取更多结果用于融合
+                top_k=fetch_k,  # 获取更多结果用于融合
                 min_score=None,
                 **kwargs
             )
@@ -91,7 +97,7 @@ class HybridRetriever(BaseRetriever):
             vector_results = self.vector_retriever.retrieve(
                 query=query,
                 chunks=chunks,
-                top_k=top_k * 2,
+                top_k=fetch_k,
                 min_score=None,
                 **kwargs
             )
@@ -109,7 +115,7 @@ class HybridRetriever(BaseRetriever):
             return combined_results[:top_k]
             
         except Exception as e:
-            print(f"混合检索失败: {str(e)}")
+            logger.error("混合检索失败: %s", e)
             # 失败时尝试返回向量检索结果
             try:
                 return self.vector_retriever.retrieve(query, chunks, top_k, min_score, **kwargs)
@@ -8,11 +8,18 @@
 
 基于向量相似度的文本检索。
 无状态设计，每次检索时传入内容块列表和embedding模型。
+内容块向量按内容哈希缓存，重复检索同一批内容块时无需重新嵌入。
 """
 
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional, Callable
 from .base_retriever import BaseRetriever
 
+logger = logging.getLogger(__name__)
+
 
 class VectorRetriever(BaseRetriever):
     """向量检索器
@@ -22,15 +29,21 @@ class VectorRetriever(BaseRetriever):
     
     def __init__(self, 
                  embedding_function: Callable,
-                 similarity_metric: str = 'cosine'):
+                 similarity_metric: str = 'cosine',
+                 cache_size: int = 10000):
         """初始化向量检索器
         
         Args:
             embedding_function: 文本嵌入函数，接受文本列表，返回向量列表
             similarity_metric: 相似度度量方式 ('cosine', 'euclidean', 'dot'，默认: 'cosine')
+            cache_size: 内容块向量缓存的最大条目数，0 表示不缓存 (默认: 10000)
         """
         self.embedding_function = embedding_function
         self.similarity_metric = similarity_metric
+        self.cache_size = cache_size
+        self._embedding_cache = OrderedDict()
+        # 同一检索器可能被多个线程共享，缓存读写需加锁
+        self._cache_lock = threading.Lock()
     
     def retrieve(self, 
                 query: str,
@@ -65,14 +78,18 @@ class VectorRetriever(BaseRetriever):
             # 生成查询向量
             query_embedding = self.embedding_function([query])[0]
             
-            # 生成文档向量
-            chunk_embeddings = self.embedding_function(chunk_texts)
+            # 生成文档向量（命中缓存的内容块不再重复嵌入）
+            chunk_embeddings = self._embed_chunks(chunk_texts)
             
             # 计算相似度
             scores = self._calculate_similarity(query_embedding, chunk_embeddings)
             
-            # 获取top_k结果
-            top_indices = np.argsort(scores)[::-1][:top_k]
+            # 获取top_k结果：先用 argpartition 选出前 top_k 个，再仅对其排序
+            if 0 < top_k < len(scores):
+                top_indices = np.argpartition(-scores, top_k - 1)[:top_k]
+                top_indices = top_indices[np.argsort(-scores[top_indices], kind='stable')]
+            else:
+                top_indices = np.argsort(-scores, kind='stable')[:top_k]
             
             # 构建结果
             results = []
@@ -102,9 +119,70 @@ class VectorRetriever(BaseRetriever):
             return results
             
         except Exception as e:
-            print(f"向量检索失败: {str(e)}")
+            logger.error("向量检索失败: %s", e)
             return []
     
+    def _embed_chunks(self, texts: List[str]) -> List:
+        """生成内容块向量，按内容哈希进行 LRU 缓存
+        
+        Args:
+            texts: 内容块文本列表
+            
+        Returns:
+            与 texts 顺序一致的向量列表
+        """
+        import numpy as np
+        
+        if self.cache_size <= 0:
+            return self.embedding_function(texts)
+        
+        keys = [hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest() for text in texts]
+        
+        # 命中的向量在锁内取出到本地，其他线程随后淘汰条目不影响本次结果；
+        # 收集未命中的文本，同一批次内的重复内容只嵌入一次
+        embeddings = {}
+        missing = {}
+        with self._cache_lock:
+            for key, text in zip(keys, texts):
+                if key in embeddings or key in missing:
+                    continue
+                embedding = self._embedding_cache.get(key)
+                if embedding is not None:
+                    self._embedding_cache.move_to_end(key)
+                    embeddings[key] = embedding
+                else:
+                    missing[key] = text
+        
+        if missing:
+            # embedding 调用在锁外进行，不阻塞其他线程
+            new_embeddings = self.embedding_function(list(missing.values()))
+            for key, embedding in zip(missing, new_embeddings):
+                embeddings[key] = np.asarray(embedding, dtype=np.float32)
+            
+            with self._cache_lock:
+                for key in missing:
+                    self._embedding_cache[key] = embeddings[key]
+                # 淘汰最久未使用的条目
+                while len(self._embedding_cache) > self.cache_size:
+                    self._embedding_cache.popitem(last=False)
+        
+        return [embeddings[key] for key in keys]
+    
+    def clear_cache(self):
+        """清空内容块向量缓存"""
+        with self._cache_lock:
+            self._embedding_cache.clear()
+    
+    def __getstate__(self):
+        # 锁无法序列化，反序列化时重建
+        state = self.__dict__.copy()
+        del state['_cache_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache_lock = threading.Lock()
+    
     def _calculate_similarity(self, query_embedding, chunk_embeddings):
         """计算相似度分数
         
@@ -117,8 +195,9 @@ class VectorRetriever(BaseRetriever):
         """
         import numpy as np
         
-        query_vec = np.array(query_embedding)
-        chunk_vecs = np.array(chunk_embeddings)
+        # 使用连续内存的 float32 矩阵，矩阵-向量乘法可走 BLAS 的 SIMD 路径
+        query_vec = np.ascontiguousarray(query_embedding, dtype=np.float32)
+        chunk_vecs = np.ascontiguousarray(chunk_embeddings, dtype=np.float32)
         
         if self.similarity_metric == 'cosine':
             # 余弦相似度
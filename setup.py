@@ -47,6 +47,12 @@ setup(
             "sphinx>=4.0",
             "sphinx-rtd-theme>=1.0",
         ],
+        "re2": [
+            "google-re2>=1.0",
+        ],
+        "faiss": [
+            "faiss-cpu>=1.7.3",
+        ],
     },
     keywords=[
         "langchain", 